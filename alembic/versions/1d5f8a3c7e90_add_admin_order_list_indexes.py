@@ -0,0 +1,40 @@
+"""add admin order list indexes
+
+Revision ID: 1d5f8a3c7e90
+Revises: 0b6e2d9f4c13
+Create Date: 2026-10-18 18:27:45.093611
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1d5f8a3c7e90"
+down_revision: Union[str, Sequence[str], None] = "0b6e2d9f4c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_orders_order_date_id",
+        "orders",
+        [sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_orders_status_order_date_id",
+        "orders",
+        ["status", sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_status_order_date_id", table_name="orders")
+    op.drop_index("ix_orders_order_date_id", table_name="orders")
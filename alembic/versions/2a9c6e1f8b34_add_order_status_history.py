@@ -0,0 +1,47 @@
+"""add order status history table
+
+Revision ID: 2a9c6e1f8b34
+Revises: 1d5f8a3c7e90
+Create Date: 2026-10-18 19:10:26.448170
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2a9c6e1f8b34"
+down_revision: Union[str, Sequence[str], None] = "1d5f8a3c7e90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "order_status_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        # Same representation as orders.status in the migrated schema.
+        sa.Column("old_status", sa.String(), nullable=False),
+        sa.Column("new_status", sa.String(), nullable=False),
+        sa.Column("changed_by", sa.Integer(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["changed_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_order_status_history_order_id_changed_at",
+        "order_status_history",
+        ["order_id", "changed_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_order_status_history_order_id_changed_at", table_name="order_status_history")
+    op.drop_table("order_status_history")
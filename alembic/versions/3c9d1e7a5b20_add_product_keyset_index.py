@@ -0,0 +1,33 @@
+"""add product keyset pagination index
+
+Revision ID: 3c9d1e7a5b20
+Revises: 6a820a636ddb
+Create Date: 2026-10-18 09:12:41.118204
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9d1e7a5b20"
+down_revision: Union[str, Sequence[str], None] = "6a820a636ddb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_products_category_id_id",
+        "products",
+        ["category_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_category_id_id", table_name="products")
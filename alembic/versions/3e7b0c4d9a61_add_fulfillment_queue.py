@@ -0,0 +1,42 @@
+"""add fulfillment queue lease columns
+
+Revision ID: 3e7b0c4d9a61
+Revises: 2a9c6e1f8b34
+Create Date: 2026-10-18 19:52:03.771592
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7b0c4d9a61"
+down_revision: Union[str, Sequence[str], None] = "2a9c6e1f8b34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("orders", sa.Column("claimed_by", sa.Integer(), nullable=True))
+    op.add_column("orders", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        "orders_claimed_by_fkey", "orders", "users", ["claimed_by"], ["id"]
+    )
+    op.create_index(
+        "ix_orders_fulfillment_queue",
+        "orders",
+        ["order_date", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'paid'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_fulfillment_queue", table_name="orders")
+    op.drop_constraint("orders_claimed_by_fkey", "orders", type_="foreignkey")
+    op.drop_column("orders", "lease_expires_at")
+    op.drop_column("orders", "claimed_by")
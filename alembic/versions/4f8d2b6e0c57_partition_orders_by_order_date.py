@@ -0,0 +1,223 @@
+"""range-partition orders and order_items by order_date
+
+Revision ID: 4f8d2b6e0c57
+Revises: 3e7b0c4d9a61
+Create Date: 2026-10-18 20:41:17.306952
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8d2b6e0c57"
+down_revision: Union[str, Sequence[str], None] = "3e7b0c4d9a61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Creates one partition per month of existing orders through three months
+# from now, named like app.partitions.partition_name.
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month date := date_trunc('month', coalesce(
+        (SELECT min(order_date) FROM orders_unpartitioned), now()
+    ) AT TIME ZONE 'UTC')::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+    tbl text;
+BEGIN
+    WHILE month <= last_month LOOP
+        FOREACH tbl IN ARRAY ARRAY['orders', 'order_items'] LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                tbl || to_char(month, '"_p"YYYY"_"MM'),
+                tbl,
+                month::text || ' 00:00:00+00',
+                (month + interval '1 month')::date::text || ' 00:00:00+00'
+            );
+        END LOOP;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_orders_id", "orders", ["id"], unique=False)
+    op.create_index(
+        "ix_orders_user_id_order_date_id",
+        "orders",
+        ["user_id", sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_orders_order_date_id",
+        "orders",
+        [sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_orders_status_order_date_id",
+        "orders",
+        ["status", sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_orders_fulfillment_queue",
+        "orders",
+        ["order_date", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'paid'"),
+    )
+    op.create_index("ix_order_items_id", "order_items", ["id"], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint("order_items_order_id_fkey", "order_items", type_="foreignkey")
+    # Partitioned orders are unique on (id, order_date) only, so the
+    # history table keeps the order id without a foreign key.
+    op.drop_constraint(
+        "order_status_history_order_id_fkey", "order_status_history", type_="foreignkey"
+    )
+
+    op.execute("UPDATE orders SET order_date = now() WHERE order_date IS NULL")
+
+    op.rename_table("orders", "orders_unpartitioned")
+    op.execute("ALTER TABLE orders_unpartitioned RENAME CONSTRAINT orders_pkey TO orders_unpartitioned_pkey")
+    op.rename_table("order_items", "order_items_unpartitioned")
+    op.execute(
+        "ALTER TABLE order_items_unpartitioned "
+        "RENAME CONSTRAINT order_items_pkey TO order_items_unpartitioned_pkey"
+    )
+    for name in (
+        "ix_orders_id",
+        "ix_orders_user_id_order_date_id",
+        "ix_orders_order_date_id",
+        "ix_orders_status_order_date_id",
+        "ix_orders_fulfillment_queue",
+    ):
+        op.drop_index(name, table_name="orders_unpartitioned")
+    op.drop_index("ix_order_items_id", table_name="order_items_unpartitioned")
+
+    op.execute(
+        "CREATE TABLE orders (LIKE orders_unpartitioned INCLUDING DEFAULTS, "
+        "PRIMARY KEY (id, order_date)) PARTITION BY RANGE (order_date)"
+    )
+    op.execute("ALTER TABLE orders ALTER COLUMN order_date SET NOT NULL")
+    op.execute(
+        "CREATE TABLE order_items (LIKE order_items_unpartitioned INCLUDING DEFAULTS, "
+        "order_date TIMESTAMP WITH TIME ZONE NOT NULL, "
+        "PRIMARY KEY (id, order_date)) PARTITION BY RANGE (order_date)"
+    )
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute("CREATE TABLE orders_default PARTITION OF orders DEFAULT")
+    op.execute("CREATE TABLE order_items_default PARTITION OF order_items DEFAULT")
+
+    op.execute(
+        "INSERT INTO orders (id, user_id, order_date, status, total_price, "
+        "item_count, claimed_by, lease_expires_at) "
+        "SELECT id, user_id, order_date, status, total_price, item_count, "
+        "claimed_by, lease_expires_at FROM orders_unpartitioned"
+    )
+    op.execute(
+        "INSERT INTO order_items (id, order_id, product_id, quantity, price, "
+        "product_name, order_date) "
+        "SELECT i.id, i.order_id, i.product_id, i.quantity, i.price, "
+        "i.product_name, o.order_date "
+        "FROM order_items_unpartitioned i JOIN orders o ON o.id = i.order_id"
+    )
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+    op.drop_table("order_items_unpartitioned")
+    op.drop_table("orders_unpartitioned")
+
+    _create_indexes()
+    op.create_index(
+        "ix_order_items_order_id",
+        "order_items",
+        ["order_id", "order_date"],
+        unique=False,
+    )
+    op.create_foreign_key("orders_user_id_fkey", "orders", "users", ["user_id"], ["id"])
+    op.create_foreign_key(
+        "orders_claimed_by_fkey", "orders", "users", ["claimed_by"], ["id"]
+    )
+    op.create_foreign_key(
+        "order_items_order_id_fkey",
+        "order_items",
+        "orders",
+        ["order_id", "order_date"],
+        ["id", "order_date"],
+    )
+    op.create_foreign_key(
+        "order_items_product_id_fkey", "order_items", "products", ["product_id"], ["id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("orders", "orders_partitioned")
+    op.execute("ALTER TABLE orders_partitioned RENAME CONSTRAINT orders_pkey TO orders_partitioned_pkey")
+    op.rename_table("order_items", "order_items_partitioned")
+    op.execute(
+        "ALTER TABLE order_items_partitioned "
+        "RENAME CONSTRAINT order_items_pkey TO order_items_partitioned_pkey"
+    )
+    op.drop_constraint("order_items_order_id_fkey", "order_items_partitioned", type_="foreignkey")
+    for name in (
+        "ix_orders_id",
+        "ix_orders_user_id_order_date_id",
+        "ix_orders_order_date_id",
+        "ix_orders_status_order_date_id",
+        "ix_orders_fulfillment_queue",
+    ):
+        op.drop_index(name, table_name="orders_partitioned")
+    op.drop_index("ix_order_items_id", table_name="order_items_partitioned")
+    op.drop_index("ix_order_items_order_id", table_name="order_items_partitioned")
+
+    op.execute(
+        "CREATE TABLE orders (LIKE orders_partitioned INCLUDING DEFAULTS, PRIMARY KEY (id))"
+    )
+    op.execute("ALTER TABLE orders ALTER COLUMN order_date DROP NOT NULL")
+    op.execute(
+        "CREATE TABLE order_items (LIKE order_items_partitioned INCLUDING DEFAULTS, PRIMARY KEY (id))"
+    )
+    op.drop_column("order_items", "order_date")
+
+    op.execute("INSERT INTO orders SELECT * FROM orders_partitioned")
+    op.execute(
+        "INSERT INTO order_items (id, order_id, product_id, quantity, price, product_name) "
+        "SELECT id, order_id, product_id, quantity, price, product_name "
+        "FROM order_items_partitioned"
+    )
+
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+    op.drop_table("order_items_partitioned")
+    op.drop_table("orders_partitioned")
+
+    _create_indexes()
+    op.create_foreign_key("orders_user_id_fkey", "orders", "users", ["user_id"], ["id"])
+    op.create_foreign_key(
+        "orders_claimed_by_fkey", "orders", "users", ["claimed_by"], ["id"]
+    )
+    op.create_foreign_key(
+        "order_items_order_id_fkey", "order_items", "orders", ["order_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "order_items_product_id_fkey", "order_items", "products", ["product_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "order_status_history_order_id_fkey",
+        "order_status_history",
+        "orders",
+        ["order_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
@@ -0,0 +1,78 @@
+"""add daily sales rollups
+
+Revision ID: 5a7c3e9b1d24
+Revises: 4f8d2b6e0c57
+Create Date: 2026-10-18 21:26:48.540113
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a7c3e9b1d24"
+down_revision: Union[str, Sequence[str], None] = "4f8d2b6e0c57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO {table} (sales_date, {key}, units_sold, revenue, order_count)
+SELECT (i.order_date AT TIME ZONE 'UTC')::date, {key_expression},
+       sum(i.quantity), sum(i.quantity * i.price), count(DISTINCT i.order_id)
+FROM order_items i
+JOIN orders o ON o.id = i.order_id AND o.order_date = i.order_date
+JOIN products p ON p.id = i.product_id
+WHERE o.status <> 'cancelled'
+GROUP BY 1, 2
+"""
+
+
+def _rollup_columns() -> list:
+    return [
+        sa.Column("units_sold", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("revenue", sa.Numeric(precision=12, scale=2), server_default="0", nullable=False),
+        sa.Column("order_count", sa.Integer(), server_default="0", nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_product_sales",
+        sa.Column("sales_date", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        *_rollup_columns(),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("sales_date", "product_id"),
+    )
+    op.create_index(
+        "ix_daily_product_sales_product_id_sales_date",
+        "daily_product_sales",
+        ["product_id", "sales_date"],
+        unique=False,
+    )
+    op.create_table(
+        "daily_category_sales",
+        sa.Column("sales_date", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        *_rollup_columns(),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("sales_date", "category_id"),
+    )
+
+    op.execute(
+        BACKFILL.format(table="daily_product_sales", key="product_id", key_expression="i.product_id")
+    )
+    op.execute(
+        BACKFILL.format(table="daily_category_sales", key="category_id", key_expression="p.category_id")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_category_sales")
+    op.drop_index("ix_daily_product_sales_product_id_sales_date", table_name="daily_product_sales")
+    op.drop_table("daily_product_sales")
@@ -0,0 +1,51 @@
+"""add product rating aggregates
+
+Revision ID: 5f2a7c9e1d43
+Revises: 8e41f0b2c6d7
+Create Date: 2026-10-18 11:26:05.774310
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a7c9e1d43"
+down_revision: Union[str, Sequence[str], None] = "8e41f0b2c6d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "products",
+        sa.Column("review_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "products",
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Backfill the aggregates from existing reviews.
+    op.execute(
+        """
+        UPDATE products
+        SET review_count = stats.review_count,
+            rating_sum = stats.rating_sum
+        FROM (
+            SELECT product_id, count(*) AS review_count, sum(rating) AS rating_sum
+            FROM reviews
+            GROUP BY product_id
+        ) AS stats
+        WHERE products.id = stats.product_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("products", "rating_sum")
+    op.drop_column("products", "review_count")
@@ -0,0 +1,45 @@
+"""add category snapshot to order items
+
+Revision ID: 7c2e5a9d4b16
+Revises: 5a7c3e9b1d24
+Create Date: 2026-10-18 23:02:37.614925
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e5a9d4b16"
+down_revision: Union[str, Sequence[str], None] = "5a7c3e9b1d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("order_items", sa.Column("category_id", sa.Integer(), nullable=True))
+
+    # Existing lines get the product's current category, which is also the
+    # one the sales rollups were backfilled with.
+    op.execute(
+        """
+        UPDATE order_items
+        SET category_id = products.category_id
+        FROM products
+        WHERE products.id = order_items.product_id
+        """
+    )
+
+    op.alter_column("order_items", "category_id", nullable=False)
+    op.create_foreign_key(
+        "order_items_category_id_fkey", "order_items", "categories", ["category_id"], ["id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("order_items_category_id_fkey", "order_items", type_="foreignkey")
+    op.drop_column("order_items", "category_id")
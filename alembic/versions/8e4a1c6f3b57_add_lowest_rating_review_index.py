@@ -0,0 +1,33 @@
+"""add lowest rating review index
+
+Revision ID: 8e4a1c6f3b57
+Revises: 7c2e5a9d4b16
+Create Date: 2026-10-18 23:41:09.207316
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4a1c6f3b57"
+down_revision: Union[str, Sequence[str], None] = "7c2e5a9d4b16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_reviews_product_id_rating_newest",
+        "reviews",
+        ["product_id", "rating", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reviews_product_id_rating_newest", table_name="reviews")
@@ -0,0 +1,43 @@
+"""add version and updated_at to products and categories
+
+Revision ID: a7d3e5f91c08
+Revises: 5f2a7c9e1d43
+Create Date: 2026-10-18 12:41:52.093617
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3e5f91c08"
+down_revision: Union[str, Sequence[str], None] = "5f2a7c9e1d43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("categories", "products"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("products", "categories"):
+        op.drop_column(table, "updated_at")
+        op.drop_column(table, "version")
@@ -0,0 +1,40 @@
+"""add review pagination indexes
+
+Revision ID: b4e8c2d6f1a9
+Revises: a7d3e5f91c08
+Create Date: 2026-10-18 14:02:18.661470
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e8c2d6f1a9"
+down_revision: Union[str, Sequence[str], None] = "a7d3e5f91c08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_reviews_product_id_created_at",
+        "reviews",
+        ["product_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_reviews_product_id_rating",
+        "reviews",
+        ["product_id", "rating", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reviews_product_id_rating", table_name="reviews")
+    op.drop_index("ix_reviews_product_id_created_at", table_name="reviews")
@@ -0,0 +1,53 @@
+"""add stored order totals
+
+Revision ID: c5f1a9d3e7b2
+Revises: b4e8c2d6f1a9
+Create Date: 2026-10-18 15:02:37.509126
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f1a9d3e7b2"
+down_revision: Union[str, Sequence[str], None] = "b4e8c2d6f1a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "orders",
+        sa.Column("total_price", sa.Numeric(10, 2), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "orders",
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Backfill the totals from existing order lines.
+    op.execute(
+        """
+        UPDATE orders
+        SET total_price = totals.total_price,
+            item_count = totals.item_count
+        FROM (
+            SELECT order_id,
+                   sum(price * quantity) AS total_price,
+                   sum(quantity) AS item_count
+            FROM order_items
+            GROUP BY order_id
+        ) AS totals
+        WHERE orders.id = totals.order_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("orders", "item_count")
+    op.drop_column("orders", "total_price")
@@ -0,0 +1,40 @@
+"""add product name snapshot to order items
+
+Revision ID: d2b7e4a8c1f6
+Revises: c5f1a9d3e7b2
+Create Date: 2026-10-18 15:48:12.331907
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7e4a8c1f6"
+down_revision: Union[str, Sequence[str], None] = "c5f1a9d3e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("order_items", sa.Column("product_name", sa.String(), nullable=True))
+
+    # Existing lines get the product's current name, the best snapshot left.
+    op.execute(
+        """
+        UPDATE order_items
+        SET product_name = products.name
+        FROM products
+        WHERE products.id = order_items.product_id
+        """
+    )
+
+    op.alter_column("order_items", "product_name", nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("order_items", "product_name")
@@ -0,0 +1,33 @@
+"""add order history index
+
+Revision ID: e9a4c7f2b5d8
+Revises: d2b7e4a8c1f6
+Create Date: 2026-10-18 16:20:54.802113
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e9a4c7f2b5d8"
+down_revision: Union[str, Sequence[str], None] = "d2b7e4a8c1f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_orders_user_id_order_date_id",
+        "orders",
+        ["user_id", sa.text("order_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_user_id_order_date_id", table_name="orders")
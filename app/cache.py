@@ -0,0 +1,110 @@
+# app/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+from app.config import settings
+
+
+class CachedProduct(NamedTuple):
+    """
+    A rendered product detail response and its validators.
+    """
+    body: bytes
+    etag: str
+    last_modified: datetime
+    headers: Dict[str, str]
+
+
+class LRUCache:
+    """
+    Thread-safe, bounded LRU cache with a per-entry time to live.
+
+    The cache is local to the worker process. Writes made through this
+    process invalidate entries immediately; writes made by other workers
+    become visible once the entry's TTL expires.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every invalidation, so a value rendered from data
+        # read before a concurrent write is never stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Stores a value. When `generation` is given and an invalidation has
+        happened since it was read, the value is considered stale and dropped.
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Rendered `ProductOut` payloads keyed by product id.
+product_cache = LRUCache(
+    max_entries=settings.PRODUCT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRODUCT_CACHE_TTL_SECONDS,
+)
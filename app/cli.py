@@ -0,0 +1,188 @@
+# app/cli.py
+
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli rebuild-ratings
+    python -m app.cli purge-idempotency-keys
+    python -m app.cli outbox-worker [--once] [--batch-size N] [--poll-interval S]
+    python -m app.cli create-order-partitions [--months-ahead N]
+    python -m app.cli detach-order-partitions --keep-months N [--archive-schema NAME]
+    python -m app.cli rebuild-sales [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+import argparse
+from datetime import date, datetime, timezone
+from typing import Optional, Sequence
+
+from app import outbox, partitions
+from app.database import SessionLocal
+from app.repositories import analytics as analytics_repository
+from app.repositories import idempotency as idempotency_repository
+from app.repositories import product as product_repository
+
+
+def rebuild_ratings(args: argparse.Namespace) -> None:
+    """
+    Rebuilds the denormalized rating aggregates on products from reviews.
+    """
+    with SessionLocal() as db:
+        corrected = product_repository.rebuild_rating_aggregates(db)
+        db.commit()
+
+    print(f"Rebuilt rating aggregates; {corrected} products corrected.")
+
+
+def purge_idempotency_keys(args: argparse.Namespace) -> None:
+    """
+    Deletes idempotency keys whose retention period has passed.
+    """
+    with SessionLocal() as db:
+        purged = idempotency_repository.purge_expired(db)
+        db.commit()
+
+    print(f"Purged {purged} expired idempotency keys.")
+
+
+def outbox_worker(args: argparse.Namespace) -> None:
+    """
+    Delivers pending outbox events to their handlers.
+    """
+    try:
+        outbox.run_worker(
+            batch_size=args.batch_size,
+            poll_interval=args.poll_interval,
+            once=args.once,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def create_order_partitions(args: argparse.Namespace) -> None:
+    """
+    Creates the monthly order partitions for the coming months.
+    """
+    with SessionLocal() as db:
+        created = partitions.create_partitions(db, months_ahead=args.months_ahead)
+        db.commit()
+
+    print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+
+
+def detach_order_partitions(args: argparse.Namespace) -> None:
+    """
+    Detaches order partitions older than the retention period.
+    """
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    before = partitions.add_months(this_month, -args.keep_months)
+
+    with SessionLocal() as db:
+        detached = partitions.detach_partitions(
+            db, before=before, archive_schema=args.archive_schema
+        )
+        db.commit()
+
+    print(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}")
+
+
+def rebuild_sales(args: argparse.Namespace) -> None:
+    """
+    Recomputes the daily sales rollups from the order history.
+    """
+    with SessionLocal() as db:
+        rows = analytics_repository.rebuild_sales(
+            db, date_from=args.date_from, date_to=args.date_to
+        )
+        db.commit()
+
+    print(f"Rebuilt sales rollups; {rows} product-day rows.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="E-commerce API maintenance commands.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_ratings_parser = subparsers.add_parser(
+        "rebuild-ratings",
+        help="Recompute product review counts and rating sums from reviews.",
+    )
+    rebuild_ratings_parser.set_defaults(handler=rebuild_ratings)
+
+    purge_keys_parser = subparsers.add_parser(
+        "purge-idempotency-keys",
+        help="Delete expired checkout idempotency keys.",
+    )
+    purge_keys_parser.set_defaults(handler=purge_idempotency_keys)
+
+    outbox_parser = subparsers.add_parser(
+        "outbox-worker",
+        help="Deliver outbox events (order emails, warehouse sync, ...).",
+    )
+    outbox_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit once no due events are left instead of polling.",
+    )
+    outbox_parser.add_argument("--batch-size", type=int, default=None)
+    outbox_parser.add_argument("--poll-interval", type=float, default=None)
+    outbox_parser.set_defaults(handler=outbox_worker)
+
+    create_partitions_parser = subparsers.add_parser(
+        "create-order-partitions",
+        help="Create monthly orders/order_items partitions ahead of time.",
+    )
+    create_partitions_parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=3,
+        help="Months after the current one to create (default: 3).",
+    )
+    create_partitions_parser.set_defaults(handler=create_order_partitions)
+
+    detach_partitions_parser = subparsers.add_parser(
+        "detach-order-partitions",
+        help="Detach monthly orders/order_items partitions older than the retention period.",
+    )
+    detach_partitions_parser.add_argument(
+        "--keep-months",
+        type=int,
+        required=True,
+        help="Full months to keep attached before the current one.",
+    )
+    detach_partitions_parser.add_argument(
+        "--archive-schema",
+        default=None,
+        help="Move detached partitions into this schema.",
+    )
+    detach_partitions_parser.set_defaults(handler=detach_order_partitions)
+
+    sales_parser = subparsers.add_parser(
+        "rebuild-sales",
+        help="Recompute the daily sales rollups from the order history.",
+    )
+    sales_parser.add_argument(
+        "--from",
+        dest="date_from",
+        type=date.fromisoformat,
+        default=None,
+        help="First day (UTC) to rebuild (default: the first order).",
+    )
+    sales_parser.add_argument(
+        "--to",
+        dest="date_to",
+        type=date.fromisoformat,
+        default=None,
+        help="Last day (UTC) to rebuild (default: the last order).",
+    )
+    sales_parser.set_defaults(handler=rebuild_sales)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,21 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # --- Caching ---
+    PRODUCT_CACHE_MAX_ENTRIES: int = 1024
+    PRODUCT_CACHE_TTL_SECONDS: int = 60
+
+    # --- Idempotency ---
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 24 * 60 * 60
+
+    # --- Outbox worker ---
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+
+    # --- Fulfillment queue ---
+    FULFILLMENT_LEASE_SECONDS: int = 300
+
     # --- Testing ---
     TEST_DATABASE_URL: Optional[str] = Field(None, env="TEST_DATABASE_URL")
 
@@ -0,0 +1,73 @@
+# app/http_cache.py
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a weak ETag from the values that identify a representation,
+    typically row ids and their version numbers.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """
+    Validator headers sent with both 200 and 304 responses.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Evaluates the request's conditional headers against the current validators.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110);
+    entity tags are compared weakly.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque_tag(etag)
+        return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have a one second resolution.
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """
+    A body-less 304 response carrying the validator headers.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -12,6 +12,8 @@ from .routers import (
     cart,
     order,
     admin_order,
+    fulfillment,
+    admin_analytics,
     review,
 )
 
@@ -33,11 +35,15 @@ async def http_exception_handler(request, exc: HTTPException):
 app.include_router(user.router)
 app.include_router(admin.router)
 app.include_router(category.router)
-app.include_router(product.router)
+# The public catalog is registered before the admin product router so that
+# anonymous GET /products/ requests are not captured by the admin-only routes.
 app.include_router(public_product.router)
+app.include_router(product.router)
 app.include_router(cart.router)
 app.include_router(order.router)
 app.include_router(admin_order.router)
+app.include_router(fulfillment.router)
+app.include_router(admin_analytics.router)
 app.include_router(review.router)
 
 
@@ -2,7 +2,11 @@ from app.database import Base
 from .user import User
 from .category import Category
 from .product import Product
-from .order import Order, OrderStatus
+from .order import Order, OrderStatus, ALLOWED_STATUS_TRANSITIONS
 from .order_item import OrderItem
 from .cart import Cart, CartItem
 from .review import Review
+from .idempotency_key import IdempotencyKey
+from .outbox_event import OutboxEvent
+from .order_status_history import OrderStatusHistory
+from .sales_rollup import DailyProductSales, DailyCategorySales
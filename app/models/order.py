@@ -1,7 +1,7 @@
 # app/models/order.py
 
 import enum
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import DDL, Column, Integer, ForeignKey, DateTime, Enum, Index, Numeric, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -16,15 +16,33 @@ class OrderStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Status changes an order may go through; anything else is rejected by
+# the bulk status endpoint.
+ALLOWED_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.PAID, OrderStatus.CANCELLED},
+    OrderStatus.PAID: {OrderStatus.SHIPPED, OrderStatus.CANCELLED},
+    OrderStatus.SHIPPED: {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
 class Order(Base):
+    """
+    An order. The table is range-partitioned by month on `order_date`
+    (see app/partitions.py), so the partition key is part of the primary
+    key; the ORM still identifies orders by `id` alone.
+    """
     __tablename__ = "orders"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     order_date = Column(
         DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
         server_default=func.now()
     )
 
@@ -39,10 +57,63 @@ class Order(Base):
         server_default=OrderStatus.PENDING.value
     )
 
-    user = relationship("User", back_populates="orders")
+    # Totals are stored when the order is placed, so listing orders never
+    # has to aggregate order_items. `item_count` counts units, not lines.
+    total_price = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Fulfillment lease: the admin currently picking a paid order, and when
+    # their claim lapses and the order returns to the queue.
+    claimed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Serves a customer's order history, newest first, with keyset paging.
+        Index(
+            "ix_orders_user_id_order_date_id",
+            user_id,
+            order_date.desc(),
+            id.desc(),
+        ),
+        # Serve the admin order list, newest first, with or without a
+        # status filter.
+        Index("ix_orders_order_date_id", order_date.desc(), id.desc()),
+        Index(
+            "ix_orders_status_order_date_id",
+            status,
+            order_date.desc(),
+            id.desc(),
+        ),
+        # The fulfillment queue: only paid orders, oldest first. Shipped and
+        # delivered history never enters the index.
+        Index(
+            "ix_orders_fulfillment_queue",
+            order_date,
+            id,
+            postgresql_where=status == OrderStatus.PAID.value,
+        ),
+        {"postgresql_partition_by": "RANGE (order_date)"},
+    )
+
+    __mapper_args__ = {
+        "primary_key": [id],
+        # Fetch order_date on insert; order lines need it for their key.
+        "eager_defaults": True,
+    }
+
+    user = relationship("User", back_populates="orders", foreign_keys=[user_id])
 
     items = relationship(
         "OrderItem",
         back_populates="order",
         cascade="all, delete-orphan"
     )
+
+
+# Catches rows outside every monthly partition, so a fresh database (and
+# the test suite) works before any partition has been created.
+event.listen(
+    Order.__table__,
+    "after_create",
+    DDL("CREATE TABLE orders_default PARTITION OF orders DEFAULT").execute_if(dialect="postgresql"),
+)
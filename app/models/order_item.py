@@ -1,13 +1,49 @@
-from sqlalchemy import Column, Integer, Numeric, ForeignKey
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    event,
+)
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class OrderItem(Base):
     __tablename__ = "order_items"
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    order_id = Column(Integer, nullable=False)
+    # Copy of the order's date: the partition key, shared with `orders`.
+    order_date = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
+    # Snapshots taken at checkout, so order history never loads live
+    # products and sales stay with the category they were made in.
+    product_name = Column(String, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     order = relationship("Order", back_populates="items")
     product = relationship("Product", back_populates="order_items")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_date"],
+            ["orders.id", "orders.order_date"],
+            name="order_items_order_id_fkey",
+        ),
+        Index("ix_order_items_order_id", "order_id", "order_date"),
+        {"postgresql_partition_by": "RANGE (order_date)"},
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
+
+
+event.listen(
+    OrderItem.__table__,
+    "after_create",
+    DDL("CREATE TABLE order_items_default PARTITION OF order_items DEFAULT").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,43 @@
+# app/models/order_status_history.py
+
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Index
+from sqlalchemy.sql import func
+
+from app.database import Base
+from .order import OrderStatus
+
+
+def _status_column(nullable: bool) -> Column:
+    return Column(
+        Enum(
+            OrderStatus,
+            name="orderstatus",
+            create_type=False,
+            values_callable=lambda enum_cls: [e.value for e in enum_cls],
+        ),
+        nullable=nullable,
+    )
+
+
+class OrderStatusHistory(Base):
+    """
+    One status change of an order, written in the same transaction as the
+    change itself.
+    """
+    __tablename__ = "order_status_history"
+
+    id = Column(Integer, primary_key=True)
+
+    # No foreign key: orders is partitioned, and history outlives
+    # partitions that are detached for archival.
+    order_id = Column(Integer, nullable=False)
+    old_status = _status_column(nullable=False)
+    new_status = _status_column(nullable=False)
+
+    # The admin who made the change.
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_order_status_history_order_id_changed_at", "order_id", "changed_at"),
+    )
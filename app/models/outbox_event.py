@@ -0,0 +1,38 @@
+# app/models/outbox_event.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    A side effect to run after a transaction commits (emails, analytics,
+    warehouse sync). Events are written in the same transaction as the
+    change they describe and delivered by the outbox worker.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Earliest time of the next delivery attempt; pushed back after failures.
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only pending events are ever scanned by the worker.
+        Index(
+            "ix_outbox_events_pending",
+            "available_at",
+            "id",
+            postgresql_where=processed_at.is_(None),
+        ),
+    )
@@ -1,11 +1,29 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func, select
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Numeric,
+    Float,
+    ForeignKey,
+    Index,
+    Computed,
+    DateTime,
+    literal_column,
+    case,
+    cast,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql import func
 
 from app.database import Base
 
 
+# Text search configuration used for the product search vector and queries.
+SEARCH_CONFIG = "english"
+
+
 class Product(Base):
     __tablename__ = "products"
 
@@ -19,6 +37,41 @@ class Product(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     category = relationship("Category")
 
+    # Full-text search document, maintained by Postgres as a generated column.
+    # Names weigh more than descriptions when ranking search results.
+    # Deferred so that regular product loads do not fetch it.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    # Denormalized review aggregates, updated together with each new review
+    # and rebuilt by `python -m app.cli rebuild-ratings`.
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Bumped by every UPDATE of the row (edits, stock changes, new reviews);
+    # used to build ETags and Last-Modified headers on public endpoints.
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("products.version") + 1,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
     reviews = relationship(
         "Review",
         back_populates="product",
@@ -30,6 +83,16 @@ class Product(Base):
         back_populates="product"
     )
 
+    __table_args__ = (
+        # Serves keyset pagination of the catalog within a category.
+        Index("ix_products_category_id_id", "category_id", "id"),
+        Index(
+            "ix_products_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+
     # -------------------------------------------------
     # Hybrid property: average_rating
     # -------------------------------------------------
@@ -37,23 +100,18 @@ class Product(Base):
     @hybrid_property
     def average_rating(self):
         """
-        Python-level calculation.
-        Used if reviews are already loaded on the Product object.
+        Python-level calculation from the stored aggregates.
         """
-        if not self.reviews:
+        if not self.review_count:
             return None
-        return sum(review.rating for review in self.reviews) / len(self.reviews)
+        return self.rating_sum / self.review_count
 
     @average_rating.expression
     def average_rating(cls):
         """
-        SQL-level calculation.
-        Generates a correlated subquery using AVG().
+        SQL-level calculation from the stored aggregates.
         """
-        from app.models.review import Review  # local import to avoid circular deps
-
-        return (
-            select(func.avg(Review.rating))
-            .where(Review.product_id == cls.id)
-            .label("average_rating")
+        return case(
+            (cls.review_count > 0, cast(cls.rating_sum, Float) / cls.review_count),
+            else_=None,
         )
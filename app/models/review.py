@@ -6,6 +6,7 @@ from sqlalchemy import (
     Text,
     CheckConstraint,
     UniqueConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -41,4 +42,17 @@ class Review(Base):
             "product_id",
             name="uq_user_product_review"
         ),
+        # Serve keyset pagination of a product's reviews by date and by rating.
+        # Both rating sorts list the newest reviews first among equal
+        # ratings: a backward scan of the first rating index serves
+        # highest-first, the second one serves lowest-first.
+        Index("ix_reviews_product_id_created_at", "product_id", "created_at", "id"),
+        Index("ix_reviews_product_id_rating", "product_id", "rating", "created_at", "id"),
+        Index(
+            "ix_reviews_product_id_rating_newest",
+            "product_id",
+            "rating",
+            created_at.desc(),
+            id.desc(),
+        ),
     )
@@ -0,0 +1,40 @@
+# app/models/sales_rollup.py
+
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric
+
+from app.database import Base
+
+
+class DailyProductSales(Base):
+    """
+    Units, revenue and orders of one product on one UTC day, over every
+    order that is not cancelled. Maintained in the transaction of each
+    checkout and cancellation; see app/repositories/analytics.py.
+    """
+    __tablename__ = "daily_product_sales"
+
+    sales_date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+
+    units_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_daily_product_sales_product_id_sales_date", "product_id", "sales_date"),
+    )
+
+
+class DailyCategorySales(Base):
+    """
+    The same totals per category, so category and revenue dashboards read
+    one row per category and day.
+    """
+    __tablename__ = "daily_category_sales"
+
+    sales_date = Column(Date, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+
+    units_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -30,5 +30,6 @@ class User(Base):
     orders = relationship(
         "Order",
         back_populates="user",
+        foreign_keys="Order.user_id",
         cascade="all, delete-orphan"
     )
@@ -0,0 +1,143 @@
+# app/outbox.py
+
+"""
+Transactional outbox.
+
+Request handlers call `enqueue` inside their own transaction, so an event
+exists if and only if the change it describes was committed. The worker
+(`python -m app.cli outbox-worker`) later delivers pending events to the
+handlers registered for their type.
+
+Delivery is at least once: an event whose handler fails is retried with
+exponential backoff, and the other handlers of the same event run again,
+so handlers must be idempotent.
+"""
+
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+
+
+Handler = Callable[[Dict[str, Any]], None]
+
+# Event types
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+# event type -> handlers, in registration order
+_handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+# Upper bound on the delay between two attempts of the same event.
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+
+def enqueue(db: Session, event_type: str, payload: Dict[str, Any]) -> None:
+    """
+    Adds an event to the caller's transaction. `payload` must be JSON
+    serializable.
+    """
+    db.add(models.OutboxEvent(event_type=event_type, payload=payload))
+
+
+def enqueue_many(db: Session, event_type: str, payloads: List[Dict[str, Any]]) -> None:
+    """
+    Adds several events of one type with a single multi-row INSERT.
+    """
+    if payloads:
+        db.execute(
+            insert(models.OutboxEvent),
+            [{"event_type": event_type, "payload": payload} for payload in payloads],
+        )
+
+
+def register_handler(event_type: str, handler: Optional[Handler] = None):
+    """
+    Registers `handler(payload)` for an event type. Can be used as a
+    decorator: `@register_handler("order.created")`.
+    """
+    def decorator(registered: Handler) -> Handler:
+        _handlers[event_type].append(registered)
+        return registered
+
+    if handler is not None:
+        return decorator(handler)
+    return decorator
+
+
+def unregister_handler(event_type: str, handler: Handler) -> None:
+    _handlers[event_type].remove(handler)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2 ** attempts, MAX_RETRY_DELAY_SECONDS))
+
+
+def run_once(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Claims one batch of due events and delivers them. Returns the number
+    of events claimed.
+
+    Events are claimed with FOR UPDATE SKIP LOCKED, so several workers can
+    run side by side without delivering the same event twice at once.
+    Events that failed `OUTBOX_MAX_ATTEMPTS` times are left in the table,
+    unprocessed, for inspection.
+    """
+    event = models.OutboxEvent
+    events = db.execute(
+        select(event)
+        .where(
+            event.processed_at.is_(None),
+            event.available_at <= func.now(),
+            event.attempts < settings.OUTBOX_MAX_ATTEMPTS,
+        )
+        .order_by(event.available_at, event.id)
+        .limit(batch_size or settings.OUTBOX_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    for outbox_event in events:
+        try:
+            for handler in list(_handlers.get(outbox_event.event_type, ())):
+                handler(outbox_event.payload)
+        except Exception as exc:
+            outbox_event.attempts += 1
+            outbox_event.last_error = f"{type(exc).__name__}: {exc}"
+            outbox_event.available_at = func.now() + retry_delay(outbox_event.attempts)
+        else:
+            outbox_event.processed_at = func.now()
+
+    db.commit()
+    return len(events)
+
+
+def run_worker(
+    batch_size: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+    once: bool = False,
+) -> None:
+    """
+    Delivers events until interrupted. Full batches are followed
+    immediately by the next one; otherwise the worker sleeps for
+    `poll_interval` seconds. With `once`, it returns as soon as no due
+    events are left instead of sleeping.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    if poll_interval is None:
+        poll_interval = settings.OUTBOX_POLL_INTERVAL_SECONDS
+
+    while True:
+        with SessionLocal() as db:
+            claimed = run_once(db, batch_size)
+
+        if claimed < batch_size:
+            if once:
+                return
+            time.sleep(poll_interval)
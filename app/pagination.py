@@ -0,0 +1,48 @@
+# app/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List
+
+from fastapi import HTTPException, status
+
+
+# Name of the response header carrying the cursor for the next page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort key of the last row on a page into an opaque cursor.
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=_json_default)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: Callable[[Any], Any]) -> List[Any]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Each key value is converted with the matching callable in `types`
+    (e.g. `int`, `float`, `datetime.fromisoformat`). Raises a 400 error
+    if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
@@ -0,0 +1,140 @@
+# app/partitions.py
+
+"""
+Monthly range partitions of `orders` and `order_items`.
+
+Both tables are partitioned by `order_date`, one partition per calendar
+month (UTC) named `<table>_pYYYY_MM`, plus a DEFAULT partition for rows
+outside every month. Partitions should be created ahead of time
+(`python -m app.cli create-order-partitions`) so the default partition
+stays empty: a month cannot be added while the default partition holds
+rows for it.
+
+Old months are detached (`detach-order-partitions`), which turns them
+into standalone tables that can be dumped, moved to an archive schema or
+dropped without touching the live tables.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# Parent tables, in dependency order: order_items references orders.
+PARTITIONED_TABLES = ("orders", "order_items")
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def _partitions_of(db: Session, table: str) -> List[str]:
+    return list(
+        db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(:table) "
+                "ORDER BY child.relname"
+            ),
+            {"table": table},
+        ).scalars()
+    )
+
+
+def create_partitions(
+    db: Session, months_ahead: int = 3, start: Optional[date] = None
+) -> List[str]:
+    """
+    Creates the monthly partitions of every partitioned table from the
+    month of `start` (default: the current month) through `months_ahead`
+    months later. Existing partitions are left alone. Returns the names
+    of the partitions created; the caller commits.
+    """
+    first = _month_start(start or datetime.now(timezone.utc).date())
+    created = []
+
+    for table in PARTITIONED_TABLES:
+        existing = set(_partitions_of(db, table))
+
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+
+            db.execute(
+                text(
+                    f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                    f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+                )
+            )
+            created.append(name)
+
+    return created
+
+
+def detach_partitions(
+    db: Session, before: date, archive_schema: Optional[str] = None
+) -> List[str]:
+    """
+    Detaches every monthly partition that ends on or before `before`.
+    Detached tables keep their data; with `archive_schema` they are also
+    moved into that schema. Returns the names of the partitions detached;
+    the caller commits.
+    """
+    if archive_schema is not None:
+        if not re.fullmatch(r"\w+", archive_schema):
+            raise ValueError(f"Invalid schema name: {archive_schema!r}")
+        db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+    detached = []
+
+    # Children first: a month of orders can only leave once nothing
+    # attached to order_items references it.
+    for table in reversed(PARTITIONED_TABLES):
+        for name in _partitions_of(db, table):
+            match = _PARTITION_NAME.match(name)
+            if not match or match.group("table") != table:
+                continue
+
+            month = date(int(match.group("year")), int(match.group("month")), 1)
+            if add_months(month, 1) > before:
+                continue
+
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+
+            # A detached partition keeps copies of the parent's foreign
+            # keys; drop the ones pointing at orders so that month of
+            # orders can be detached as well.
+            for constraint in db.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = to_regclass(:name) AND contype = 'f' "
+                    "AND confrelid = 'orders'::regclass"
+                ),
+                {"name": name},
+            ).scalars().all():
+                db.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint}"'))
+
+            if archive_schema is not None:
+                db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+
+            detached.append(name)
+
+    return detached
@@ -0,0 +1,240 @@
+# app/repositories/analytics.py
+
+"""
+Daily sales rollups.
+
+`daily_product_sales` and `daily_category_sales` hold, per UTC day, the
+units, revenue and number of orders of every order that is not
+cancelled. Checkout adds its order to them and a cancellation takes it
+out again, each with one upsert per table inside the transaction of the
+change itself, so dashboards read pre-aggregated rows instead of scanning
+order_items.
+
+Sales count towards the category their order lines were checked out in
+(`order_items.category_id`), so a cancellation takes an order out of
+the same rows its checkout added it to, even if the products have moved
+since. `rebuild_sales` (`python -m app.cli rebuild-sales`) recomputes a
+date range from the order history.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, cast, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+# Orders that do not count as sales.
+EXCLUDED_STATUSES = (models.OrderStatus.CANCELLED,)
+
+
+def counts_as_sale(order_status: models.OrderStatus) -> bool:
+    return order_status not in EXCLUDED_STATUSES
+
+
+def _sales_date(order_date):
+    return cast(func.timezone("UTC", order_date), Date)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _upsert_sales(
+    db: Session, rollup, key_name: str, key, where: Sequence, sign: int
+) -> None:
+    """
+    Adds `sign` times the sales of the order lines matching `where` to
+    `rollup`, grouped by day and `key` (a column of order_items, stored as
+    `key_name`):
+
+        INSERT INTO <rollup> (...)
+        SELECT day, key, sum(quantity), sum(quantity * price), count(DISTINCT order_id)
+        FROM order_items WHERE ... GROUP BY day, key
+        ON CONFLICT DO UPDATE SET units_sold = units_sold + excluded.units_sold, ...
+
+    Rows are written in key order so concurrent checkouts lock them in
+    the same order.
+    """
+    item = models.OrderItem
+    sales_date = _sales_date(item.order_date).label("sales_date")
+
+    lines = (
+        select(
+            sales_date,
+            key.label(key_name),
+            (sign * func.sum(item.quantity)).label("units_sold"),
+            (sign * func.sum(item.quantity * item.price)).label("revenue"),
+            (sign * func.count(item.order_id.distinct())).label("order_count"),
+        )
+        .where(*where)
+        .group_by(sales_date, key)
+        .order_by(sales_date, key)
+    )
+
+    stmt = insert(rollup).from_select(
+        ["sales_date", key_name, "units_sold", "revenue", "order_count"],
+        lines,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["sales_date", key_name],
+            set_={
+                "units_sold": rollup.units_sold + stmt.excluded.units_sold,
+                "revenue": rollup.revenue + stmt.excluded.revenue,
+                "order_count": rollup.order_count + stmt.excluded.order_count,
+            },
+        )
+    )
+
+
+def _apply(db: Session, where: Sequence, sign: int) -> None:
+    _upsert_sales(
+        db, models.DailyProductSales, "product_id", models.OrderItem.product_id, where, sign
+    )
+    _upsert_sales(
+        db, models.DailyCategorySales, "category_id", models.OrderItem.category_id, where, sign
+    )
+
+
+def add_order_sales(
+    db: Session, orders: Sequence[Tuple[int, datetime]], sign: int = 1
+) -> None:
+    """
+    Adds the lines of the given `(order_id, order_date)` orders to the
+    rollups, or takes them out with `sign=-1`. Matching on the partition
+    key as well lets the planner skip every other order_items partition.
+    The caller commits.
+    """
+    if orders:
+        item = models.OrderItem
+        _apply(db, [tuple_(item.order_id, item.order_date).in_(orders)], sign)
+
+
+def _day_filters(rollup, date_from: Optional[date], date_to: Optional[date]) -> list:
+    where = []
+    if date_from is not None:
+        where.append(rollup.sales_date >= date_from)
+    if date_to is not None:
+        where.append(rollup.sales_date <= date_to)
+    return where
+
+
+def rebuild_sales(
+    db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None
+) -> int:
+    """
+    Recomputes the rollups of the days from `date_from` through `date_to`
+    (both inclusive; open-ended when omitted) from the order history.
+    Returns the number of product rows written; the caller commits.
+
+    Both rollup tables are locked in EXCLUSIVE mode until the caller
+    commits: dashboards keep reading, while checkouts and cancellations
+    wait for the rebuild instead of being counted both by it and by
+    their own upsert.
+    """
+    db.execute(
+        text(
+            f"LOCK TABLE {models.DailyProductSales.__tablename__}, "
+            f"{models.DailyCategorySales.__tablename__} IN EXCLUSIVE MODE"
+        )
+    )
+    for rollup in (models.DailyProductSales, models.DailyCategorySales):
+        db.execute(delete(rollup).where(*_day_filters(rollup, date_from, date_to)))
+
+    item = models.OrderItem
+    # Matched on the partition key as well, so each order_items partition
+    # only meets its own orders partition.
+    counted_orders = select(models.Order.id, models.Order.order_date).where(
+        models.Order.status.notin_(EXCLUDED_STATUSES)
+    )
+    where = [tuple_(item.order_id, item.order_date).in_(counted_orders)]
+    if date_from is not None:
+        where.append(item.order_date >= _day_start(date_from))
+    if date_to is not None:
+        where.append(item.order_date < _day_start(date_to + timedelta(days=1)))
+
+    _apply(db, where, 1)
+
+    return db.execute(
+        select(func.count())
+        .select_from(models.DailyProductSales)
+        .where(*_day_filters(models.DailyProductSales, date_from, date_to))
+    ).scalar_one()
+
+
+def daily_sales(db: Session, date_from: date, date_to: date) -> List:
+    """
+    Units and revenue per day with any sales, oldest first.
+    """
+    rollup = models.DailyCategorySales
+    return db.execute(
+        select(
+            rollup.sales_date,
+            func.sum(rollup.units_sold).label("units_sold"),
+            func.sum(rollup.revenue).label("revenue"),
+        )
+        .where(*_day_filters(rollup, date_from, date_to))
+        .group_by(rollup.sales_date)
+        .having(func.sum(rollup.units_sold) != 0)
+        .order_by(rollup.sales_date)
+    ).all()
+
+
+def top_products(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    limit: int,
+    category_id: Optional[int] = None,
+) -> List:
+    """
+    The products with the highest revenue over the range.
+    """
+    rollup = models.DailyProductSales
+    where = _day_filters(rollup, date_from, date_to)
+    if category_id is not None:
+        where.append(models.Product.category_id == category_id)
+
+    revenue = func.sum(rollup.revenue)
+    return db.execute(
+        select(
+            rollup.product_id,
+            models.Product.name.label("product_name"),
+            func.sum(rollup.units_sold).label("units_sold"),
+            revenue.label("revenue"),
+            func.sum(rollup.order_count).label("order_count"),
+        )
+        .join(models.Product, models.Product.id == rollup.product_id)
+        .where(*where)
+        .group_by(rollup.product_id, models.Product.name)
+        .having(func.sum(rollup.units_sold) != 0)
+        .order_by(revenue.desc(), rollup.product_id)
+        .limit(limit)
+    ).all()
+
+
+def top_categories(db: Session, date_from: date, date_to: date, limit: int) -> List:
+    """
+    The categories with the highest revenue over the range.
+    """
+    rollup = models.DailyCategorySales
+    revenue = func.sum(rollup.revenue)
+    return db.execute(
+        select(
+            rollup.category_id,
+            models.Category.name.label("category_name"),
+            func.sum(rollup.units_sold).label("units_sold"),
+            revenue.label("revenue"),
+            func.sum(rollup.order_count).label("order_count"),
+        )
+        .join(models.Category, models.Category.id == rollup.category_id)
+        .where(*_day_filters(rollup, date_from, date_to))
+        .group_by(rollup.category_id, models.Category.name)
+        .having(func.sum(rollup.units_sold) != 0)
+        .order_by(revenue.desc(), rollup.category_id)
+        .limit(limit)
+    ).all()
@@ -0,0 +1,175 @@
+# app/repositories/cart.py
+
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Integer, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app import models
+from app.repositories import product as product_repository
+
+
+def load_cart(db: Session, user_id: int) -> Optional[models.Cart]:
+    """
+    Loads a user's cart with everything `CartOut` renders, in a bounded
+    number of queries regardless of the number of lines: the cart, its
+    items joined with their products and categories, and the products'
+    reviews.
+    """
+    return (
+        db.query(models.Cart)
+        .options(
+            product_repository.detail_options(
+                selectinload(models.Cart.items).joinedload(models.CartItem.product)
+            )
+        )
+        .filter(models.Cart.user_id == user_id)
+        .first()
+    )
+
+
+def cart_total(db: Session, cart_id: int) -> Decimal:
+    """
+    Computes the price of a cart's contents at current product prices in SQL.
+    """
+    total = db.scalar(
+        select(func.sum(models.CartItem.quantity * models.Product.price))
+        .join(models.CartItem.product)
+        .where(models.CartItem.cart_id == cart_id)
+    )
+    return total if total is not None else Decimal("0")
+
+
+def load_cart_item(db: Session, cart_id: int, product_id: int) -> Optional[models.CartItem]:
+    """
+    Loads a single cart line with everything `CartItemOut` renders.
+    """
+    return (
+        db.query(models.CartItem)
+        .options(product_repository.detail_options(joinedload(models.CartItem.product)))
+        .filter(
+            models.CartItem.cart_id == cart_id,
+            models.CartItem.product_id == product_id,
+        )
+        .first()
+    )
+
+
+def get_or_create_cart_id(db: Session, user_id: int) -> int:
+    """
+    Returns the id of the user's cart, creating the cart if needed, with a
+    single upsert. Safe against concurrent first requests of the same user.
+
+    The upsert also locks the cart row until the transaction ends, so
+    concurrent mutations of the same cart are applied one after another.
+    """
+    statement = insert(models.Cart).values(user_id=user_id)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.Cart.user_id],
+        # A no-op update, so that RETURNING yields the existing row.
+        set_={"user_id": statement.excluded.user_id},
+    ).returning(models.Cart.id)
+
+    return db.execute(statement).scalar_one()
+
+
+def add_item(db: Session, cart_id: int, product_id: int, quantity: int) -> Optional[int]:
+    """
+    Adds `quantity` units of a product to a cart with one atomic statement:
+
+        INSERT ... SELECT ... WHERE stock >= quantity
+        ON CONFLICT (cart_id, product_id)
+        DO UPDATE SET quantity = cart_items.quantity + excluded.quantity
+        WHERE <product stock> >= cart_items.quantity + excluded.quantity
+
+    Concurrent additions to the same line are serialized by the row lock
+    taken by the upsert, so no update is lost. Returns the new quantity
+    of the line, or None when the product does not exist or does not
+    have enough stock.
+    """
+    statement = insert(models.CartItem).from_select(
+        ["cart_id", "product_id", "quantity"],
+        select(
+            literal(cart_id, Integer),
+            models.Product.id,
+            literal(quantity, Integer),
+        ).where(
+            models.Product.id == product_id,
+            models.Product.stock >= quantity,
+        ),
+    )
+    new_quantity = models.CartItem.quantity + statement.excluded.quantity
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.CartItem.cart_id, models.CartItem.product_id],
+        set_={"quantity": new_quantity},
+        where=(
+            select(models.Product.stock)
+            .where(models.Product.id == product_id)
+            .scalar_subquery()
+            >= new_quantity
+        ),
+    ).returning(models.CartItem.quantity)
+
+    return db.execute(statement).scalar_one_or_none()
+
+
+def cart_quantities(db: Session, cart_id: int) -> Dict[int, int]:
+    """
+    Maps each product in the cart to its quantity.
+    """
+    rows = db.execute(
+        select(models.CartItem.product_id, models.CartItem.quantity).where(
+            models.CartItem.cart_id == cart_id
+        )
+    )
+    return {product_id: quantity for product_id, quantity in rows}
+
+
+def set_quantities(db: Session, cart_id: int, quantities: Dict[int, int]) -> None:
+    """
+    Sets the quantity of several cart lines, creating missing lines, with
+    one multi-row upsert. The caller validates stock.
+    """
+    if not quantities:
+        return
+
+    statement = insert(models.CartItem).values([
+        {"cart_id": cart_id, "product_id": product_id, "quantity": quantity}
+        for product_id, quantity in quantities.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.CartItem.cart_id, models.CartItem.product_id],
+        set_={"quantity": statement.excluded.quantity},
+    )
+    db.execute(statement)
+
+
+def remove_items(db: Session, cart_id: int, product_ids: Iterable[int]) -> None:
+    """
+    Deletes several cart lines with one statement.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+
+    db.execute(
+        delete(models.CartItem)
+        .where(
+            models.CartItem.cart_id == cart_id,
+            models.CartItem.product_id.in_(product_ids),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def clear_cart(db: Session, cart_id: int) -> None:
+    """
+    Deletes every line of a cart with one statement.
+    """
+    db.execute(
+        delete(models.CartItem)
+        .where(models.CartItem.cart_id == cart_id)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,105 @@
+# app/repositories/fulfillment.py
+
+from datetime import timedelta
+from typing import Dict, List, Sequence
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.repositories import order as order_repository
+
+
+# Column values that end a lease. Only paid orders are leased, so every
+# change of status away from paid applies them.
+END_LEASE = {"claimed_by": None, "lease_expires_at": None}
+
+
+def _held_by(worker_id: int) -> list:
+    """
+    Orders still leased to `worker_id`.
+    """
+    order = models.Order
+    return [
+        order.status == models.OrderStatus.PAID,
+        order.claimed_by == worker_id,
+        order.lease_expires_at > func.now(),
+    ]
+
+
+def claim_orders(db: Session, worker_id: int, limit: int, lease_seconds: int) -> List[int]:
+    """
+    Leases the oldest `limit` unclaimed paid orders to `worker_id`:
+
+        UPDATE orders SET claimed_by = :worker, lease_expires_at = now() + :lease
+        FROM (SELECT id FROM orders
+              WHERE status = 'paid'
+                AND (lease_expires_at IS NULL OR lease_expires_at <= now())
+              ORDER BY order_date, id LIMIT :limit
+              FOR UPDATE SKIP LOCKED) AS available
+        WHERE orders.id = available.id
+
+    SKIP LOCKED lets concurrent workers pass over each other's rows
+    instead of queueing behind them, and the partial index on paid orders
+    keeps the scan independent of order history. Orders whose lease ran
+    out are claimable again. Returns the claimed ids; the caller commits.
+    """
+    order = models.Order
+    available = (
+        select(order.id)
+        .where(
+            order.status == models.OrderStatus.PAID,
+            or_(order.lease_expires_at.is_(None), order.lease_expires_at <= func.now()),
+        )
+        .order_by(order.order_date, order.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .subquery("available")
+    )
+
+    return list(
+        db.execute(
+            update(order)
+            .where(order.id == available.c.id)
+            .values(
+                claimed_by=worker_id,
+                lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+
+
+def acknowledge_orders(
+    db: Session, worker_id: int, order_ids: Sequence[int]
+) -> Dict[int, models.OrderStatus]:
+    """
+    Marks orders still leased to `worker_id` as shipped and ends their
+    lease. Returns the previous status of every acknowledged order.
+    """
+    return order_repository.transition_statuses(
+        db,
+        order_ids,
+        models.OrderStatus.SHIPPED,
+        worker_id,
+        where=_held_by(worker_id),
+        values=END_LEASE,
+    )
+
+
+def release_orders(db: Session, worker_id: int, order_ids: Sequence[int]) -> List[int]:
+    """
+    Returns orders leased to `worker_id` to the queue. Returns the ids
+    released.
+    """
+    order = models.Order
+    return list(
+        db.execute(
+            update(order)
+            .where(order.id.in_(order_ids), *_held_by(worker_id))
+            .values(claimed_by=None, lease_expires_at=None)
+            .returning(order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
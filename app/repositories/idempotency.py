@@ -0,0 +1,77 @@
+# app/repositories/idempotency.py
+
+from datetime import timedelta
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def claim_key(db: Session, user_id: int, key: str, ttl_seconds: int) -> Optional[int]:
+    """
+    Claims an idempotency key for the current transaction with one upsert.
+
+    Returns the id of the claimed row, or None when the key was already
+    used and has not expired; the stored response should then be
+    replayed. If another transaction holds an uncommitted claim on the
+    same key, this statement waits for it to finish: a commit turns the
+    claim into a replay, a rollback lets this request proceed.
+    """
+    expires_at = func.now() + timedelta(seconds=ttl_seconds)
+    statement = insert(models.IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        expires_at=expires_at,
+    )
+    statement = statement.on_conflict_do_update(
+        constraint="uq_idempotency_keys_user_id_key",
+        # An expired key is reused as if it had never been seen.
+        set_={
+            "status_code": None,
+            "response_body": None,
+            "created_at": func.now(),
+            "expires_at": expires_at,
+        },
+        where=models.IdempotencyKey.expires_at <= func.now(),
+    ).returning(models.IdempotencyKey.id)
+
+    return db.execute(statement).scalar_one_or_none()
+
+
+def stored_response(db: Session, user_id: int, key: str) -> Optional[models.IdempotencyKey]:
+    return db.execute(
+        select(models.IdempotencyKey).where(
+            models.IdempotencyKey.user_id == user_id,
+            models.IdempotencyKey.key == key,
+        )
+    ).scalar_one_or_none()
+
+
+def save_response(db: Session, claim_id: int, status_code: int, body: Any) -> None:
+    """
+    Records the response of a claimed request. The caller commits it
+    together with the work the key guards.
+    """
+    db.execute(
+        update(models.IdempotencyKey)
+        .where(models.IdempotencyKey.id == claim_id)
+        .values(status_code=status_code, response_body=body)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired(db: Session) -> int:
+    """
+    Deletes expired idempotency keys. Returns the number of keys removed.
+
+    The caller is responsible for committing.
+    """
+    result = db.execute(
+        delete(models.IdempotencyKey)
+        .where(models.IdempotencyKey.expires_at <= func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,222 @@
+# app/repositories/order.py
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import column, func, insert, select, table, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app import models, outbox
+from app.repositories import analytics as analytics_repository
+from app.repositories import product as product_repository
+
+
+def order_options(expand_product: bool = False) -> tuple:
+    """
+    Loader options for order responses. Lines are fetched with one extra
+    query per page; live products (with category and reviews) only when
+    the caller expands them.
+    """
+    items = selectinload(models.Order.items)
+    if expand_product:
+        items = product_repository.detail_options(
+            items.joinedload(models.OrderItem.product)
+        )
+    return (items,)
+
+
+def order_filters(
+    status: Optional[models.OrderStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    min_total: Optional[Decimal] = None,
+) -> list:
+    """
+    WHERE clauses for the admin order filters; `date_to` is exclusive.
+    """
+    order = models.Order
+    where = []
+    if status is not None:
+        where.append(order.status == status)
+    if date_from is not None:
+        where.append(order.order_date >= date_from)
+    if date_to is not None:
+        where.append(order.order_date < date_to)
+    if user_id is not None:
+        where.append(order.user_id == user_id)
+    if min_total is not None:
+        where.append(order.total_price >= min_total)
+    return where
+
+
+# Planner statistics of every table.
+_pg_class = table("pg_class", column("oid"), column("reltuples"), schema="pg_catalog")
+
+
+class _Explain(Executable, ClauseElement):
+    """
+    `EXPLAIN (FORMAT JSON) <statement>`, with the statement's parameters
+    bound as usual.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def exact_count(db: Session, where: list) -> int:
+    return db.execute(
+        select(func.count()).select_from(models.Order).where(*where)
+    ).scalar_one()
+
+
+def estimated_count(db: Session, where: list) -> int:
+    """
+    Estimates the number of orders matching `where` from planner
+    statistics, without scanning: `pg_class.reltuples` when there is no
+    filter, otherwise the row estimate of the filtered scan's plan.
+    """
+    if not where:
+        reltuples = db.execute(
+            select(_pg_class.c.reltuples).where(
+                _pg_class.c.oid == func.to_regclass(models.Order.__tablename__)
+            )
+        ).scalar()
+        # -1 means the table has never been analyzed.
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    plan = db.execute(_Explain(select(models.Order.id).where(*where))).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def record_status_changes(
+    db: Session,
+    changes: Sequence[tuple],
+    new_status: models.OrderStatus,
+    changed_by: Optional[int],
+) -> None:
+    """
+    Writes the history rows and outbox events for `(order_id, order_date,
+    user_id, old_status)` changes, with one multi-row INSERT each, and
+    takes cancelled orders out of the sales rollups.
+    """
+    if not changes:
+        return
+
+    counted = analytics_repository.counts_as_sale(new_status)
+    analytics_repository.add_order_sales(
+        db,
+        [
+            (order_id, order_date)
+            for order_id, order_date, _, old_status in changes
+            if analytics_repository.counts_as_sale(old_status) != counted
+        ],
+        sign=1 if counted else -1,
+    )
+
+    db.execute(
+        insert(models.OrderStatusHistory),
+        [
+            {
+                "order_id": order_id,
+                "old_status": old_status,
+                "new_status": new_status,
+                "changed_by": changed_by,
+            }
+            for order_id, _, _, old_status in changes
+        ],
+    )
+    outbox.enqueue_many(
+        db,
+        outbox.ORDER_STATUS_CHANGED,
+        [
+            {
+                "order_id": order_id,
+                "user_id": user_id,
+                "old_status": old_status.value,
+                "new_status": new_status.value,
+            }
+            for order_id, _, user_id, old_status in changes
+        ],
+    )
+
+
+def transition_sources(new_status: models.OrderStatus) -> list:
+    """
+    The statuses an order may move to `new_status` from.
+    """
+    return [
+        status
+        for status, targets in models.ALLOWED_STATUS_TRANSITIONS.items()
+        if new_status in targets
+    ]
+
+
+def transition_statuses(
+    db: Session,
+    order_ids: Sequence[int],
+    new_status: models.OrderStatus,
+    changed_by: Optional[int],
+    where: Sequence = (),
+    values: Optional[dict] = None,
+) -> Dict[int, models.OrderStatus]:
+    """
+    Moves the given orders to `new_status` with one UPDATE:
+
+        UPDATE orders SET status = :new_status
+        FROM (SELECT id, status FROM orders
+              WHERE id IN (...) AND status IN (<allowed sources>)
+              ORDER BY id FOR UPDATE) AS old
+        WHERE orders.id = old.id
+        RETURNING orders.id, orders.order_date, orders.user_id, old.status
+
+    Only orders whose current status allows the transition, and that
+    match the extra `where` clauses, are changed; `values` sets further
+    columns. History rows and outbox events are written for each change.
+    Returns the previous status of every changed order; the caller
+    commits.
+    """
+    sources = transition_sources(new_status)
+    if not order_ids or not sources:
+        return {}
+
+    order = models.Order
+    old = (
+        select(order.id, order.status)
+        .where(order.id.in_(order_ids), order.status.in_(sources), *where)
+        .order_by(order.id)
+        .with_for_update()
+        .subquery("old")
+    )
+    changes = db.execute(
+        update(order)
+        .where(order.id == old.c.id)
+        .values(status=new_status, **(values or {}))
+        .returning(order.id, order.order_date, order.user_id, old.c.status)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    record_status_changes(db, changes, new_status, changed_by)
+    return {order_id: old_status for order_id, _, _, old_status in changes}
+
+
+def current_statuses(db: Session, order_ids: Sequence[int]) -> Dict[int, models.OrderStatus]:
+    if not order_ids:
+        return {}
+    return dict(
+        db.execute(
+            select(models.Order.id, models.Order.status).where(
+                models.Order.id.in_(order_ids)
+            )
+        ).all()
+    )
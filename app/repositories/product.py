@@ -0,0 +1,141 @@
+# app/repositories/product.py
+
+from typing import Dict
+
+from sqlalchemy import Integer, column, exists, func, select, update, values
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+
+from app import models
+
+
+def summary_options() -> tuple:
+    """
+    Loader options for `ProductSummaryOut`: only the listed columns plus the
+    category, fetched in the same query. Reviews are never loaded.
+    """
+    return (
+        load_only(
+            models.Product.id,
+            models.Product.name,
+            models.Product.price,
+            models.Product.stock,
+            models.Product.review_count,
+            models.Product.rating_sum,
+            models.Product.version,
+            models.Product.updated_at,
+        ),
+        joinedload(models.Product.category),
+    )
+
+
+def detail_options(path):
+    """
+    Loader options for rendering `ProductOut` under a relationship path:
+    the category joined in, the reviews in one extra query per page.
+    """
+    return path.options(
+        joinedload(models.Product.category),
+        selectinload(models.Product.reviews),
+    )
+
+
+def rebuild_rating_aggregates(db: Session) -> int:
+    """
+    Recomputes `review_count` and `rating_sum` for every product from the
+    reviews table. Only products whose stored aggregates drifted are
+    updated. Returns the number of products corrected.
+
+    The caller is responsible for committing.
+    """
+    stats = (
+        select(
+            models.Review.product_id,
+            func.count().label("review_count"),
+            func.sum(models.Review.rating).label("rating_sum"),
+        )
+        .group_by(models.Review.product_id)
+        .subquery()
+    )
+
+    reviewed = db.execute(
+        update(models.Product)
+        .where(
+            models.Product.id == stats.c.product_id,
+            (models.Product.review_count != stats.c.review_count)
+            | (models.Product.rating_sum != stats.c.rating_sum),
+        )
+        .values(
+            review_count=stats.c.review_count,
+            rating_sum=stats.c.rating_sum,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    unreviewed = db.execute(
+        update(models.Product)
+        .where(
+            (models.Product.review_count != 0) | (models.Product.rating_sum != 0),
+            ~exists().where(models.Review.product_id == models.Product.id),
+        )
+        .values(review_count=0, rating_sum=0)
+        .execution_options(synchronize_session=False)
+    )
+
+    return reviewed.rowcount + unreviewed.rowcount
+
+
+def reserve_stock(db: Session, quantities: Dict[int, int]) -> Dict[int, Row]:
+    """
+    Decrements the stock of several products with one conditional UPDATE:
+
+        WITH locked AS MATERIALIZED (
+            SELECT id FROM products WHERE id IN (...) ORDER BY id FOR UPDATE
+        )
+        UPDATE products SET stock = stock - lines.quantity
+        FROM locked, (VALUES ...) AS lines (product_id, quantity)
+        WHERE products.id = locked.id AND products.id = lines.product_id
+          AND products.stock >= lines.quantity
+        RETURNING products.id, products.name, products.price, products.category_id
+
+    Rows are locked in id order so concurrent checkouts over overlapping
+    products cannot deadlock. Returns the `(id, name, price, category_id)` row of every
+    product whose stock was decremented, keyed by id; products missing
+    from the result did not have enough stock, and the caller must roll
+    back.
+    """
+    if not quantities:
+        return {}
+
+    product_ids = sorted(quantities)
+    locked = (
+        select(models.Product.id)
+        .where(models.Product.id.in_(product_ids))
+        .order_by(models.Product.id)
+        .with_for_update()
+        .cte("locked")
+        .prefix_with("MATERIALIZED")
+    )
+    lines = values(
+        column("product_id", Integer),
+        column("quantity", Integer),
+        name="lines",
+    ).data([(product_id, quantities[product_id]) for product_id in product_ids])
+
+    rows = db.execute(
+        update(models.Product)
+        .where(
+            models.Product.id == locked.c.id,
+            models.Product.id == lines.c.product_id,
+            models.Product.stock >= lines.c.quantity,
+        )
+        .values(stock=models.Product.stock - lines.c.quantity)
+        .returning(
+            models.Product.id,
+            models.Product.name,
+            models.Product.price,
+            models.Product.category_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return {row.id: row for row in rows}
@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.schemas.user import UserOut
+from app.schemas.cache import CacheStatsOut
 from app.dependencies import get_db, get_current_admin_user
+from app.cache import product_cache
 
 router = APIRouter(
     prefix="/admin",
@@ -20,3 +22,12 @@ def get_all_users(db: Session = Depends(get_db)):
     This endpoint is protected and only accessible by users with the 'admin' role.
     """
     return db.query(User).all()
+
+
+@router.get("/cache/products", response_model=CacheStatsOut)
+def get_product_cache_stats():
+    """
+    Reports the size and hit, miss and eviction counters of this worker's
+    product detail cache, to help size PRODUCT_CACHE_MAX_ENTRIES.
+    """
+    return product_cache.stats()
@@ -0,0 +1,88 @@
+# app/routers/admin_analytics.py
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import schemas, dependencies
+from ..repositories import analytics as analytics_repository
+
+
+router = APIRouter(
+    prefix="/admin/analytics",
+    tags=["Admin - Analytics"],
+    dependencies=[Depends(dependencies.get_current_admin_user)]
+)
+
+# Days covered when no range is given, and the longest range accepted.
+DEFAULT_ANALYTICS_DAYS = 30
+MAX_ANALYTICS_DAYS = 366
+
+
+def _date_range(
+    date_from: Optional[date] = Query(
+        default=None,
+        description="First day (UTC) to include; defaults to 30 days before date_to"
+    ),
+    date_to: Optional[date] = Query(
+        default=None,
+        description="Last day (UTC) to include; defaults to today"
+    ),
+) -> Tuple[date, date]:
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_ANALYTICS_DAYS - 1)
+
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to.",
+        )
+    if (date_to - date_from).days >= MAX_ANALYTICS_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date ranges are limited to {MAX_ANALYTICS_DAYS} days.",
+        )
+    return date_from, date_to
+
+
+@router.get("/sales/daily", response_model=List[schemas.DailySalesOut])
+def get_daily_sales(
+    days: Tuple[date, date] = Depends(_date_range),
+    db: Session = Depends(dependencies.get_db),
+):
+    """
+    Units sold and revenue per day, oldest first. Admin access is required.
+
+    Days without sales are omitted; cancelled orders are not counted.
+    """
+    return analytics_repository.daily_sales(db, *days)
+
+
+@router.get("/sales/products", response_model=List[schemas.ProductSalesOut])
+def get_top_products(
+    days: Tuple[date, date] = Depends(_date_range),
+    db: Session = Depends(dependencies.get_db),
+    category_id: Optional[int] = Query(
+        default=None,
+        description="Only rank products currently in this category"
+    ),
+    limit: int = Query(default=10, ge=1, le=100, description="The maximum number of products to return"),
+):
+    """
+    The best-selling products by revenue over the range. Admin access is required.
+    """
+    return analytics_repository.top_products(db, *days, limit, category_id=category_id)
+
+
+@router.get("/sales/categories", response_model=List[schemas.CategorySalesOut])
+def get_top_categories(
+    days: Tuple[date, date] = Depends(_date_range),
+    db: Session = Depends(dependencies.get_db),
+    limit: int = Query(default=10, ge=1, le=100, description="The maximum number of categories to return"),
+):
+    """
+    The best-selling categories by revenue over the range. Admin access is required.
+    """
+    return analytics_repository.top_categories(db, *days, limit)
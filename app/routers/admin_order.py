@@ -1,10 +1,16 @@
 # app/routers/admin_order.py
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import Iterator, List, Optional
+from datetime import datetime
+from decimal import Decimal
 
 from .. import models, schemas, dependencies
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from ..repositories import order as order_repository
+from ..repositories import fulfillment as fulfillment_repository
 
 
 router = APIRouter(
@@ -13,39 +19,234 @@ router = APIRouter(
     dependencies=[Depends(dependencies.get_current_admin_user)]
 )
 
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_TYPE_HEADER = "X-Total-Count-Type"
+
+# Orders changed per UPDATE (and per commit) by the bulk status endpoint.
+BULK_STATUS_CHUNK_SIZE = 500
+
 
 @router.get("/", response_model=List[schemas.AdminOrderOut])
 def get_all_orders(
+    response: Response,
     db: Session = Depends(dependencies.get_db),
-    skip: int = Query(default=0, ge=0, description="The number of items to skip"),
-    limit: int = Query(default=100, ge=1, le=250, description="The maximum number of items to return")
+    status_filter: Optional[models.OrderStatus] = Query(
+        default=None,
+        alias="status",
+        description="Only return orders with this status"
+    ),
+    date_from: Optional[datetime] = Query(
+        default=None,
+        description="Only return orders placed at or after this time"
+    ),
+    date_to: Optional[datetime] = Query(
+        default=None,
+        description="Only return orders placed before this time"
+    ),
+    user_id: Optional[int] = Query(default=None, description="Only return orders of this user"),
+    min_total: Optional[Decimal] = Query(
+        default=None,
+        ge=0,
+        description="Only return orders totalling at least this amount"
+    ),
+    skip: int = Query(
+        default=0,
+        ge=0,
+        description="The number of items to skip (ignored when a cursor is given)"
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    limit: int = Query(default=100, ge=1, le=250, description="The maximum number of items to return"),
+    count: Optional[schemas.OrderCount] = Query(
+        default=None,
+        description="Also return the number of matching orders in X-Total-Count: "
+                    "`exact` counts them, `estimated` reads planner statistics"
+    ),
 ):
     """
-    Retrieve a list of all orders from all users. Admin access is required.
-    Includes pagination to handle large numbers of orders.
+    Retrieve a page of orders from all users, newest first. Admin access is required.
+
+    When more orders are available, the X-Next-Cursor response header
+    carries the cursor for the next page. With `count`, the X-Total-Count
+    header carries the number of matching orders and X-Total-Count-Type
+    says whether it is exact or estimated.
     """
-    orders = (
-        db.query(models.Order)
-        .options(joinedload(models.Order.user))
-        .order_by(models.Order.order_date.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    order = models.Order
+    where = order_repository.order_filters(
+        status=status_filter,
+        date_from=date_from,
+        date_to=date_to,
+        user_id=user_id,
+        min_total=min_total,
+    )
+
+    query_db = (
+        db.query(order)
+        .options(joinedload(order.user), *order_repository.order_options())
+        .filter(*where)
+        .order_by(order.order_date.desc(), order.id.desc())
+    )
+
+    if cursor is not None:
+        last_order_date, last_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        query_db = query_db.filter(
+            tuple_(order.order_date, order.id) < tuple_(last_order_date, last_id),
+            # Lets the planner prune partitions newer than the cursor.
+            order.order_date <= last_order_date,
+        )
+    elif skip:
+        query_db = query_db.offset(skip)
+
+    # Fetch one extra row to find out whether another page exists.
+    orders = query_db.limit(limit + 1).all()
+
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.order_date, last.id)
+
+    if count == schemas.OrderCount.EXACT:
+        response.headers[TOTAL_COUNT_HEADER] = str(order_repository.exact_count(db, where))
+        response.headers[TOTAL_COUNT_TYPE_HEADER] = count.value
+    elif count == schemas.OrderCount.ESTIMATED:
+        response.headers[TOTAL_COUNT_HEADER] = str(order_repository.estimated_count(db, where))
+        response.headers[TOTAL_COUNT_TYPE_HEADER] = count.value
+
+    return [
+        schemas.AdminOrderOut.from_order(row, user=row.user)
+        for row in orders
+    ]
+
+
+def _bulk_chunks(db: Session, bulk_update: schemas.OrderBulkStatusUpdate) -> Iterator[Optional[List[int]]]:
+    """
+    Yields the order ids of a bulk update in chunks of
+    BULK_STATUS_CHUNK_SIZE. Filtered orders are read one chunk at a time
+    with an id cursor, after the previous chunk was committed; a final
+    None means that more than MAX_BULK_ORDER_IDS orders matched.
+    """
+    if bulk_update.order_ids is not None:
+        order_ids = list(dict.fromkeys(bulk_update.order_ids))
+        for start in range(0, len(order_ids), BULK_STATUS_CHUNK_SIZE):
+            yield order_ids[start:start + BULK_STATUS_CHUNK_SIZE]
+        return
+
+    criteria = bulk_update.filter
+    where = order_repository.order_filters(
+        status=criteria.status,
+        date_from=criteria.date_from,
+        date_to=criteria.date_to,
+        user_id=criteria.user_id,
+    )
+    where.append(
+        models.Order.status.in_(order_repository.transition_sources(bulk_update.status))
     )
 
-    return orders
+    selected = 0
+    last_id = None
+    while True:
+        statement = select(models.Order.id).where(*where).order_by(models.Order.id)
+        if last_id is not None:
+            statement = statement.where(models.Order.id > last_id)
+
+        # One id past the cap tells whether matching orders are left.
+        budget = schemas.MAX_BULK_ORDER_IDS - selected
+        chunk = list(
+            db.execute(statement.limit(min(BULK_STATUS_CHUNK_SIZE, budget + 1))).scalars()
+        )
+        if len(chunk) > budget:
+            if budget:
+                yield chunk[:budget]
+            yield None
+            return
+        if not chunk:
+            return
+
+        yield chunk
+        selected += len(chunk)
+        last_id = chunk[-1]
+
+
+@router.post("/status", response_model=schemas.OrderBulkStatusResult)
+def bulk_update_order_status(
+    bulk_update: schemas.OrderBulkStatusUpdate,
+    db: Session = Depends(dependencies.get_db),
+    current_admin: models.User = Depends(dependencies.get_current_admin_user)
+):
+    """
+    Move many orders to one status. Admin access is required.
+
+    Orders are selected by id or by filter and changed in chunks of
+    BULK_STATUS_CHUNK_SIZE, one UPDATE and one commit per chunk. Orders
+    whose current status does not allow the transition are left alone.
+    The response reports the outcome for every selected order.
+
+    A filter only selects orders that can make the transition, read one
+    chunk at a time in id order, and at most MAX_BULK_ORDER_IDS of them
+    per request; `has_more` tells whether matching orders are left.
+    """
+    new_status = bulk_update.status
+
+    results = []
+    updated = 0
+    has_more = False
+    for chunk in _bulk_chunks(db, bulk_update):
+        if chunk is None:
+            has_more = True
+            break
+
+        changed = order_repository.transition_statuses(
+            db, chunk, new_status, current_admin.id, values=fulfillment_repository.END_LEASE
+        )
+        db.commit()
+        updated += len(changed)
+
+        remaining = order_repository.current_statuses(
+            db, [order_id for order_id in chunk if order_id not in changed]
+        )
+
+        for order_id in chunk:
+            if order_id in changed:
+                previous, result = changed[order_id], schemas.OrderStatusChangeOutcome.UPDATED
+            elif order_id not in remaining:
+                previous, result = None, schemas.OrderStatusChangeOutcome.NOT_FOUND
+            elif remaining[order_id] == new_status:
+                previous, result = new_status, schemas.OrderStatusChangeOutcome.UNCHANGED
+            else:
+                previous, result = remaining[order_id], schemas.OrderStatusChangeOutcome.INVALID_TRANSITION
+
+            results.append(
+                schemas.OrderStatusChangeResult(
+                    order_id=order_id, previous_status=previous, result=result
+                )
+            )
+
+    return schemas.OrderBulkStatusResult(
+        status=new_status, updated=updated, results=results, has_more=has_more
+    )
 
 
 @router.patch("/{order_id}", response_model=schemas.AdminOrderOut)
 def update_order_status(
     order_id: int,
     order_update: schemas.OrderStatusUpdate,
-    db: Session = Depends(dependencies.get_db)
+    db: Session = Depends(dependencies.get_db),
+    current_admin: models.User = Depends(dependencies.get_current_admin_user)
 ):
     """
     Update the status of a specific order. Admin access is required.
     """
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    # The row stays locked until commit, so concurrent updates of the same
+    # order see each other's status and record (and count) each change once.
+    order = (
+        db.query(models.Order)
+        .options(joinedload(models.Order.user), *order_repository.order_options())
+        .filter(models.Order.id == order_id)
+        .with_for_update(of=models.Order)
+        .first()
+    )
 
     if not order:
         raise HTTPException(
@@ -53,9 +254,21 @@ def update_order_status(
             detail=f"Order with id {order_id} not found."
         )
 
+    old_status = order.status
     order.status = order_update.status
 
+    if order.status != old_status:
+        # A paid order leaving the queue also leaves its picker's lease.
+        for column, value in fulfillment_repository.END_LEASE.items():
+            setattr(order, column, value)
+        order_repository.record_status_changes(
+            db,
+            [(order.id, order.order_date, order.user_id, old_status)],
+            order.status,
+            current_admin.id,
+        )
+
     db.commit()
     db.refresh(order)
 
-    return order
+    return schemas.AdminOrderOut.from_order(order, user=order.user)
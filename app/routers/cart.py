@@ -1,15 +1,21 @@
 # app/routers/cart.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from decimal import Decimal
 from app import models, schemas, dependencies
+from app.repositories import cart as cart_repository
 
 router = APIRouter(
     prefix="/cart",
     tags=["Shopping Cart"]
 )
 
+# Upper bound on the number of operations in one bulk cart mutation.
+MAX_CART_OPERATIONS = 100
+
 # ---------------------------------------------------
 # GET /cart/  → View cart
 # ---------------------------------------------------
@@ -18,23 +24,16 @@ def get_user_cart(
     db: Session = Depends(dependencies.get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
-    cart = current_user.cart
+    cart = cart_repository.load_cart(db, current_user.id)
 
     if not cart:
-        cart = models.Cart(user_id=current_user.id)
-        db.add(cart)
+        cart_repository.get_or_create_cart_id(db, current_user.id)
         db.commit()
-        db.refresh(cart)
-
-    total_price = sum(
-    Decimal(str(item.product.price)) * item.quantity
-    for item in cart.items
-    )
-
+        return schemas.CartOut(items=[], total_price=0)
 
     return schemas.CartOut(
-    items=[schemas.CartItemOut.model_validate(item) for item in cart.items],
-    total_price=total_price,
+        items=[schemas.CartItemOut.model_validate(item) for item in cart.items],
+        total_price=cart_repository.cart_total(db, cart.id),
     )
 
 
@@ -52,61 +51,99 @@ def add_item_to_cart(
     db: Session = Depends(dependencies.get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
-    cart = current_user.cart
-    if not cart:
-        cart = models.Cart(user_id=current_user.id)
-        db.add(cart)
-        db.commit()
-        db.refresh(cart)
-
-    product = (
-        db.query(models.Product)
-        .filter(models.Product.id == item_data.product_id)
-        .first()
+    cart_id = cart_repository.get_or_create_cart_id(db, current_user.id)
+    quantity = cart_repository.add_item(
+        db, cart_id, item_data.product_id, item_data.quantity
     )
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
 
-    cart_item = (
-        db.query(models.CartItem)
-        .filter(
-            models.CartItem.cart_id == cart.id,
-            models.CartItem.product_id == product.id
+    if quantity is None:
+        product_exists = (
+            db.query(models.Product.id)
+            .filter(models.Product.id == item_data.product_id)
+            .first()
         )
-        .first()
-    )
-
-    if cart_item:
-        new_quantity = cart_item.quantity + item_data.quantity
-        if new_quantity > product.stock:
-            raise HTTPException(
-                status_code=400,
-                detail="Insufficient stock"
-            )
-        cart_item.quantity = new_quantity
-        db.commit()
-        db.refresh(cart_item)
-        return cart_item
-
-    if item_data.quantity > product.stock:
+        if not product_exists:
+            raise HTTPException(status_code=404, detail="Product not found")
         raise HTTPException(
             status_code=400,
             detail="Insufficient stock"
         )
 
-    cart_item = models.CartItem(
-        cart_id=cart.id,
-        product_id=product.id,
-        quantity=item_data.quantity
-    )
-    db.add(cart_item)
     db.commit()
-    db.refresh(cart_item)
 
+    cart_item = cart_repository.load_cart_item(db, cart_id, item_data.product_id)
     return schemas.CartItemOut.model_validate(cart_item)
 
 
 
+# ---------------------------------------------------
+# PATCH /cart/items  → Apply several line changes at once
+# ---------------------------------------------------
+@router.patch("/items", response_model=schemas.CartOut)
+def update_cart_items(
+    operations: List[schemas.CartItemOperation] = Body(
+        ..., min_length=1, max_length=MAX_CART_OPERATIONS
+    ),
+    db: Session = Depends(dependencies.get_db),
+    current_user: models.User = Depends(dependencies.get_current_user)
+):
+    """
+    Applies a list of set/add/remove operations in order, in one
+    transaction. Either every operation is applied or none is.
+    """
+    cart_id = cart_repository.get_or_create_cart_id(db, current_user.id)
+    quantities = cart_repository.cart_quantities(db, cart_id)
+    original = dict(quantities)
+
+    for operation in operations:
+        if operation.op == schemas.CartItemOperationType.REMOVE:
+            quantities.pop(operation.product_id, None)
+        elif operation.op == schemas.CartItemOperationType.ADD:
+            quantities[operation.product_id] = (
+                quantities.get(operation.product_id, 0) + operation.quantity
+            )
+        else:
+            quantities[operation.product_id] = operation.quantity
+
+    changed = {
+        product_id: quantity
+        for product_id, quantity in quantities.items()
+        if original.get(product_id) != quantity
+    }
+
+    # Validate stock of every touched product with a single IN query.
+    stock = dict(
+        db.execute(
+            select(models.Product.id, models.Product.stock).where(
+                models.Product.id.in_(changed)
+            )
+        ).all()
+    ) if changed else {}
+
+    for product_id, quantity in changed.items():
+        if product_id not in stock:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Product not found: {product_id}"
+            )
+        if quantity > stock[product_id]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for product {product_id}"
+            )
+
+    cart_repository.remove_items(db, cart_id, original.keys() - quantities.keys())
+    cart_repository.set_quantities(db, cart_id, changed)
+    db.commit()
+
+    cart = cart_repository.load_cart(db, current_user.id)
+    return schemas.CartOut(
+        items=[schemas.CartItemOut.model_validate(item) for item in cart.items],
+        total_price=cart_repository.cart_total(db, cart_id),
+    )
+
+
+
 # ---------------------------------------------------
 # PUT /cart/items/{product_id}  → Update quantity
 # ---------------------------------------------------
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from .. import models, schemas, dependencies
+from app.cache import product_cache
 
 # Create a new router instance for category-related endpoints.
 router = APIRouter(
@@ -81,6 +82,8 @@ def update_category(category_id: int, category_update: schemas.CategoryCreate, d
         
     category.name = category_update.name
     db.commit()
+    # Cached product payloads embed the category.
+    product_cache.clear()
     db.refresh(category)
     return category
 
@@ -99,5 +102,6 @@ def delete_category(category_id: int, db: Session = Depends(dependencies.get_db)
     
     db.delete(category)
     db.commit()
+    product_cache.clear()
     # A 204 response should not have a body, so we return None.
     return None
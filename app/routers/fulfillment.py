@@ -0,0 +1,103 @@
+# app/routers/fulfillment.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session, joinedload
+
+from .. import models, schemas, dependencies
+from ..config import settings
+from ..repositories import fulfillment as fulfillment_repository
+from ..repositories import order as order_repository
+
+
+router = APIRouter(
+    prefix="/admin/fulfillment",
+    tags=["Admin - Fulfillment"],
+    dependencies=[Depends(dependencies.get_current_admin_user)]
+)
+
+
+@router.post("/claim", response_model=schemas.FulfillmentClaimOut)
+def claim_orders(
+    db: Session = Depends(dependencies.get_db),
+    current_admin: models.User = Depends(dependencies.get_current_admin_user),
+    limit: int = Query(default=10, ge=1, le=100, description="The maximum number of orders to claim"),
+    lease_seconds: Optional[int] = Query(
+        default=None,
+        ge=10,
+        le=3600,
+        description="How long the claim lasts (defaults to FULFILLMENT_LEASE_SECONDS)"
+    ),
+):
+    """
+    Lease the next paid orders to the caller, oldest first. Admin access is required.
+
+    Concurrent workers never receive the same order. Claimed orders must
+    be acknowledged (shipped) or released before the lease runs out, or
+    they return to the queue.
+    """
+    order_ids = fulfillment_repository.claim_orders(
+        db,
+        current_admin.id,
+        limit,
+        lease_seconds or settings.FULFILLMENT_LEASE_SECONDS,
+    )
+    db.commit()
+
+    if not order_ids:
+        return schemas.FulfillmentClaimOut(orders=[])
+
+    orders = (
+        db.query(models.Order)
+        .options(joinedload(models.Order.user), *order_repository.order_options())
+        .filter(models.Order.id.in_(order_ids))
+        .order_by(models.Order.order_date, models.Order.id)
+        .all()
+    )
+
+    return schemas.FulfillmentClaimOut(
+        lease_expires_at=orders[0].lease_expires_at,
+        orders=[schemas.AdminOrderOut.from_order(order, user=order.user) for order in orders],
+    )
+
+
+@router.post("/ack", response_model=schemas.FulfillmentBatchOut)
+def acknowledge_orders(
+    batch: schemas.FulfillmentOrderIds,
+    db: Session = Depends(dependencies.get_db),
+    current_admin: models.User = Depends(dependencies.get_current_admin_user),
+):
+    """
+    Mark claimed orders as shipped. Admin access is required.
+
+    Only orders the caller still holds a live lease on are shipped; the
+    change is recorded in the status history and the outbox.
+    """
+    order_ids = list(dict.fromkeys(batch.order_ids))
+    shipped = fulfillment_repository.acknowledge_orders(db, current_admin.id, order_ids)
+    db.commit()
+
+    return schemas.FulfillmentBatchOut(
+        succeeded=[order_id for order_id in order_ids if order_id in shipped],
+        rejected=[order_id for order_id in order_ids if order_id not in shipped],
+    )
+
+
+@router.post("/release", response_model=schemas.FulfillmentBatchOut)
+def release_orders(
+    batch: schemas.FulfillmentOrderIds,
+    db: Session = Depends(dependencies.get_db),
+    current_admin: models.User = Depends(dependencies.get_current_admin_user),
+):
+    """
+    Return claimed orders to the queue without shipping them. Admin access is required.
+    """
+    order_ids = list(dict.fromkeys(batch.order_ids))
+    released = set(fulfillment_repository.release_orders(db, current_admin.id, order_ids))
+    db.commit()
+
+    return schemas.FulfillmentBatchOut(
+        succeeded=[order_id for order_id in order_ids if order_id in released],
+        rejected=[order_id for order_id in order_ids if order_id not in released],
+    )
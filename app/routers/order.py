@@ -1,86 +1,166 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
-from typing import List
-from decimal import Decimal
+from typing import List, Optional
+from datetime import datetime
 
-from app import models, schemas, dependencies
+from app import models, outbox, schemas, dependencies
+from app.cache import product_cache
+from app.config import settings
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.repositories import analytics as analytics_repository
+from app.repositories import cart as cart_repository
+from app.repositories import idempotency as idempotency_repository
+from app.repositories import order as order_repository
+from app.repositories import product as product_repository
 
 router = APIRouter(
     prefix="/orders",
     tags=["Orders"],
 )
 
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# Set on responses replayed from a stored idempotency key.
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
+
 
 # ---------------------------------------------------
 # POST /orders/ → Create order from cart (USER)
 # ---------------------------------------------------
 @router.post("/", response_model=schemas.OrderOut, status_code=status.HTTP_201_CREATED)
 def create_order(
+    idempotency_key: Optional[str] = Header(
+        default=None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        min_length=1,
+        max_length=255,
+        description="Retries with the same key replay the first response",
+    ),
     db: Session = Depends(dependencies.get_db),
     current_user: models.User = Depends(dependencies.get_current_user),
 ):
-    cart = current_user.cart
-
-    if not cart or not cart.items:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot create an order from an empty cart.",
-        )
+    """
+    Places an order for everything in the current user's cart.
 
+    With an Idempotency-Key header, the response is stored together with
+    the order, and a retry with the same key returns it again instead of
+    placing a second order. A retry that arrives while the first request
+    is still running waits for it to finish.
+    """
     try:
-        
-        for cart_item in cart.items:
-            if cart_item.quantity > cart_item.product.stock:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Insufficient stock",
+        claim_id = None
+        if idempotency_key is not None:
+            claim_id = idempotency_repository.claim_key(
+                db,
+                current_user.id,
+                idempotency_key,
+                settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+            )
+            if claim_id is None:
+                stored = idempotency_repository.stored_response(
+                    db, current_user.id, idempotency_key
+                )
+                # The key expired and was purged between the claim and the
+                # read, or holds no response: let the client retry.
+                if stored is None or stored.status_code is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="The Idempotency-Key could not be replayed; retry the request.",
+                    )
+                return JSONResponse(
+                    status_code=stored.status_code,
+                    content=stored.response_body,
+                    headers={IDEMPOTENT_REPLAY_HEADER: "true"},
                 )
 
-        
-        order = models.Order(user_id=current_user.id)
-        db.add(order)
-        db.flush()
+        cart = current_user.cart
 
-        order_items: list[models.OrderItem] = []
+        if not cart or not cart.items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot create an order from an empty cart.",
+            )
 
-        for cart_item in cart.items:
-            product = cart_item.product
+        quantities = {item.product_id: item.quantity for item in cart.items}
 
-            order_item = models.OrderItem(
-                order_id=order.id,
-                product_id=product.id,
-                quantity=cart_item.quantity,
-                price=product.price,
+        # One conditional UPDATE decrements every line, or reports which
+        # products are short; stock is never checked in Python.
+        reserved = product_repository.reserve_stock(db, quantities)
+
+        short = sorted(quantities.keys() - reserved.keys())
+        if short:
+            available = dict(
+                db.execute(
+                    select(models.Product.id, models.Product.stock)
+                    .where(models.Product.id.in_(short))
+                ).all()
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="; ".join(
+                    f"Insufficient stock for product {product_id}: "
+                    f"requested {quantities[product_id]}, "
+                    f"available {available.get(product_id, 0)}"
+                    for product_id in short
+                ),
             )
 
-            db.add(order_item)
-            order_items.append(order_item)
+        order = models.Order(
+            user_id=current_user.id,
+            total_price=sum(
+                reserved[product_id].price * quantity
+                for product_id, quantity in quantities.items()
+            ),
+            item_count=sum(quantities.values()),
+        )
+        db.add(order)
+        db.flush()
+        order_id, order_date = order.id, order.order_date
 
-            product.stock -= cart_item.quantity
+        # All order lines in a single multi-row INSERT.
+        db.execute(
+            insert(models.OrderItem),
+            [
+                {
+                    "order_id": order_id,
+                    "order_date": order_date,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "price": reserved[product_id].price,
+                    "product_name": reserved[product_id].name,
+                    "category_id": reserved[product_id].category_id,
+                }
+                for product_id, quantity in quantities.items()
+            ],
+        )
 
-        
-        cart.items.clear()
+        cart_repository.clear_cart(db, cart.id)
+        analytics_repository.add_order_sales(db, [(order_id, order_date)])
+
+        order = (
+            db.query(models.Order)
+            .options(*order_repository.order_options())
+            .filter(models.Order.id == order_id, models.Order.order_date == order_date)
+            .one()
+        )
+        order_out = schemas.OrderOut.from_order(order)
+        body = order_out.model_dump(mode="json")
+
+        # Side effects (emails, warehouse sync) run later from the outbox.
+        outbox.enqueue(db, outbox.ORDER_CREATED, {"user_id": current_user.id, **body})
+
+        if claim_id is not None:
+            idempotency_repository.save_response(
+                db, claim_id, status.HTTP_201_CREATED, body
+            )
 
-        
         db.commit()
 
-        total_price = sum(
-            item.price * item.quantity for item in order_items
-        )
+        # Cached product payloads include the stock that was just reduced.
+        product_cache.invalidate(*quantities)
 
-        return schemas.OrderOut(
-            id=order.id,
-            status=order.status,
-            total_price=Decimal(total_price),
-            items=[
-                schemas.OrderItemOut(
-                    product=item.product,
-                    quantity=item.quantity,
-                    price_at_purchase=item.price,
-                )
-                for item in order_items
-            ],
-        )
+        return order_out
 
     except HTTPException:
         db.rollback()
@@ -92,40 +172,79 @@ def create_order(
 # ---------------------------------------------------
 @router.get("/", response_model=List[schemas.OrderOut])
 def get_user_orders(
+    response: Response,
+    status_filter: Optional[models.OrderStatus] = Query(
+        default=None,
+        alias="status",
+        description="Only return orders with this status",
+    ),
+    date_from: Optional[datetime] = Query(
+        default=None,
+        description="Only return orders placed at or after this time",
+    ),
+    date_to: Optional[datetime] = Query(
+        default=None,
+        description="Only return orders placed before this time",
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(
+        default=20,
+        ge=1,
+        le=100,
+        description="The maximum number of orders to return",
+    ),
+    expand: Optional[schemas.OrderExpand] = Query(
+        default=None,
+        description="Set to `product` to embed the live product of each line.",
+    ),
     db: Session = Depends(dependencies.get_db),
     current_user: models.User = Depends(dependencies.get_current_user),
 ):
-    orders = (
-        db.query(models.Order)
-        .filter(models.Order.user_id == current_user.id)
-        .order_by(models.Order.order_date.desc())
-        .all()
+    """
+    Retrieves one page of the current user's orders, newest first.
+
+    When more orders are available, the X-Next-Cursor response header
+    carries the cursor for the next page. Lines are loaded with one extra
+    query per page, however many orders the page holds.
+    """
+    order = models.Order
+    expand_product = expand == schemas.OrderExpand.PRODUCT
+
+    query_db = (
+        db.query(order)
+        .options(*order_repository.order_options(expand_product))
+        .filter(order.user_id == current_user.id)
+        .order_by(order.order_date.desc(), order.id.desc())
     )
 
-    result: list[schemas.OrderOut] = []
+    if status_filter is not None:
+        query_db = query_db.filter(order.status == status_filter)
+    if date_from is not None:
+        query_db = query_db.filter(order.order_date >= date_from)
+    if date_to is not None:
+        query_db = query_db.filter(order.order_date < date_to)
 
-    for order in orders:
-        total_price = sum(
-            item.price * item.quantity for item in order.items
+    if cursor is not None:
+        last_order_date, last_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        query_db = query_db.filter(
+            tuple_(order.order_date, order.id) < tuple_(last_order_date, last_id),
+            # Implied by the row comparison, but only this form lets the
+            # planner prune newer partitions.
+            order.order_date <= last_order_date,
         )
 
-        result.append(
-            schemas.OrderOut(
-                id=order.id,
-                status=order.status,
-                total_price=Decimal(total_price),
-                items=[
-                    schemas.OrderItemOut(
-                        product=item.product,
-                        quantity=item.quantity,
-                        price_at_purchase=item.price,
-                    )
-                    for item in order.items
-                ],
-            )
-        )
+    # Fetch one extra row to find out whether another page exists.
+    orders = query_db.limit(limit + 1).all()
+
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.order_date, last.id)
 
-    return result
+    return [schemas.OrderOut.from_order(order, expand_product) for order in orders]
 
 # ---------------------------------------------------
 # GET /orders/{order_id} → Order details (USER)
@@ -133,11 +252,17 @@ def get_user_orders(
 @router.get("/{order_id}", response_model=schemas.OrderOut)
 def get_user_order_details(
     order_id: int,
+    expand: Optional[schemas.OrderExpand] = Query(
+        default=None,
+        description="Set to `product` to embed the live product of each line.",
+    ),
     db: Session = Depends(dependencies.get_db),
     current_user: models.User = Depends(dependencies.get_current_user),
 ):
+    expand_product = expand == schemas.OrderExpand.PRODUCT
     order = (
         db.query(models.Order)
+        .options(*order_repository.order_options(expand_product))
         .filter(models.Order.id == order_id)
         .first()
     )
@@ -154,20 +279,4 @@ def get_user_order_details(
             detail="Not authorized to view this order.",
         )
 
-    total_price = sum(
-        item.price * item.quantity for item in order.items
-    )
-
-    return schemas.OrderOut(
-        id=order.id,
-        status=order.status,
-        total_price=Decimal(total_price),
-        items=[
-            schemas.OrderItemOut(
-                product=item.product,
-                quantity=item.quantity,
-                price_at_purchase=item.price,
-            )
-            for item in order.items
-        ],
-    )
+    return schemas.OrderOut.from_order(order, expand_product)
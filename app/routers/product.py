@@ -1,8 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from typing import List
 
 from .. import models, schemas, dependencies
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.repositories import product as product_repository
+from app.cache import product_cache
 
 router = APIRouter(
     prefix="/products",
@@ -11,6 +21,13 @@ router = APIRouter(
     dependencies=[Depends(dependencies.get_current_admin_user)]
 )
 
+# Rows validated and inserted per transaction during a bulk import.
+IMPORT_CHUNK_SIZE = 1000
+# Per-row errors returned by a bulk import; further errors are only counted.
+MAX_IMPORT_ERRORS = 1000
+# Rows fetched per round trip from the server-side cursor during an export.
+EXPORT_BATCH_SIZE = 1000
+
 @router.post("/", response_model=schemas.ProductOut, status_code=status.HTTP_201_CREATED)
 def create_product(product: schemas.ProductCreate, db: Session = Depends(dependencies.get_db)):
     category = db.query(models.Category).filter(models.Category.id == product.category_id).first()
@@ -26,16 +43,50 @@ def create_product(product: schemas.ProductCreate, db: Session = Depends(depende
     db.refresh(new_product)
     return new_product
 
-@router.get("/", response_model=List[schemas.ProductOut])
-def get_all_products(db: Session = Depends(dependencies.get_db)):
+# Served under /admin: the public router, registered first, already owns
+# GET /products/.
+@router.get("/admin", response_model=List[schemas.ProductSummaryOut])
+def get_all_products(
+    response: Response,
+    db: Session = Depends(dependencies.get_db),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=250,
+        description="The maximum number of items to return"
+    ),
+):
     """
-    Retrieve a list of all products. Admin access is required.
-    Note: In a real-world application, you would add pagination here.
+    Retrieve one page of products in summary form, ordered by ID. Admin access is required.
+
+    When more products are available, the X-Next-Cursor response header
+    carries the cursor for the next page.
     """
-    products = db.query(models.Product).all()
+    query_db = (
+        db.query(models.Product)
+        .options(*product_repository.summary_options())
+        .order_by(models.Product.id)
+    )
+    if cursor is not None:
+        (last_id,) = decode_cursor(cursor, int)
+        query_db = query_db.filter(models.Product.id > last_id)
+
+    # Fetch one extra row to find out whether another page exists.
+    products = query_db.limit(limit + 1).all()
+
+    if len(products) > limit:
+        products = products[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(products[-1].id)
+
     return products
 
-@router.get("/{product_id}", response_model=schemas.ProductOut)
+# Served under /admin: the public router, registered first, already owns
+# GET /products/{product_id}.
+@router.get("/admin/{product_id:int}", response_model=schemas.ProductOut)
 def get_product_by_id(product_id: int, db: Session = Depends(dependencies.get_db)):
     """
     Retrieve a single product by its ID. Admin access is required.
@@ -48,7 +99,81 @@ def get_product_by_id(product_id: int, db: Session = Depends(dependencies.get_db
         )
     return product
 
-@router.put("/{product_id}", response_model=schemas.ProductOut)
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "The catalog, one product per line.",
+        }
+    },
+)
+def export_products(
+    file_format: schemas.ProductFileFormat = Query(
+        default=schemas.ProductFileFormat.NDJSON,
+        alias="format",
+        description="ndjson (default) or csv",
+    ),
+    db: Session = Depends(dependencies.get_db),
+):
+    """
+    Stream the whole catalog as NDJSON or CSV. Admin access is required.
+
+    Rows are read through a server-side cursor in batches and written to
+    the response as they arrive, so memory use stays constant and the
+    first bytes are sent before the whole catalog has been read.
+    Reviews are summarized by their count and average rating.
+    """
+    columns = (
+        models.Product.id,
+        models.Product.name,
+        models.Product.description,
+        models.Product.price,
+        models.Product.stock,
+        models.Product.category_id,
+        models.Product.review_count,
+        models.Product.average_rating.label("average_rating"),
+    )
+    statement = (
+        select(*columns)
+        .order_by(models.Product.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    fieldnames = [column.key for column in columns]
+
+    def generate_ndjson() -> Iterator[str]:
+        for batch in db.execute(statement).partitions():
+            yield "".join(
+                json.dumps(row._asdict(), default=str) + "\n" for row in batch
+            )
+
+    def generate_csv() -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fieldnames)
+        for batch in db.execute(statement).partitions():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    if file_format == schemas.ProductFileFormat.CSV:
+        content, media_type = generate_csv(), "text/csv"
+    else:
+        content, media_type = generate_ndjson(), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{file_format.value}"'
+        },
+    )
+
+@router.put("/{product_id:int}", response_model=schemas.ProductOut)
 def update_product(product_id: int, product_update: schemas.ProductUpdate, db: Session = Depends(dependencies.get_db)):
     
    
@@ -72,11 +197,12 @@ def update_product(product_id: int, product_update: schemas.ProductUpdate, db: S
     
     product_query.update(product_update.model_dump(), synchronize_session=False)
     db.commit()
+    product_cache.invalidate(product_id)
     
     db.refresh(product)
     return product
 
-@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{product_id:int}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_product(product_id: int, db: Session = Depends(dependencies.get_db)):
     """
     Delete a product. Admin access is required.
@@ -90,5 +216,148 @@ def delete_product(product_id: int, db: Session = Depends(dependencies.get_db)):
     
     db.delete(product)
     db.commit()
+    product_cache.invalidate(product_id)
     
-    return None
\ No newline at end of file
+    return None
+
+
+# -------------------------------------------------
+# Bulk import
+# -------------------------------------------------
+def _read_csv_rows(text: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields (row number, row) pairs from a CSV file with a header row.
+    Empty cells are treated as missing values.
+    """
+    reader = csv.DictReader(text)
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, {
+            key: value for key, value in row.items() if value not in ("", None)
+        }
+
+
+def _read_ndjson_rows(text: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields (row number, row) pairs from a newline-delimited JSON file.
+    Lines that are not valid JSON are yielded as ValueError instances.
+    """
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as exc:
+            yield row_number, ValueError(f"Invalid JSON: {exc}")
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+@router.post("/import", response_model=schemas.ProductImportResult)
+def import_products(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    file_format: Optional[schemas.ProductFileFormat] = Query(
+        default=None,
+        alias="format",
+        description="File format; inferred from the file name when omitted",
+    ),
+    db: Session = Depends(dependencies.get_db),
+):
+    """
+    Bulk-create products from a CSV or NDJSON file. Admin access is required.
+
+    Each row has the fields of ProductCreate. The upload is read as a
+    stream and processed in chunks: rows are validated, their categories
+    are resolved with one query per chunk, and valid rows are written
+    with a single multi-row INSERT and committed. Invalid rows are
+    skipped and reported by row number, so memory use does not depend
+    on the size of the file.
+    """
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        if filename.endswith(".csv"):
+            file_format = schemas.ProductFileFormat.CSV
+        elif filename.endswith((".ndjson", ".jsonl")):
+            file_format = schemas.ProductFileFormat.NDJSON
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot infer the file format; pass format=csv or format=ndjson.",
+            )
+
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    rows = (
+        _read_csv_rows(text)
+        if file_format == schemas.ProductFileFormat.CSV
+        else _read_ndjson_rows(text)
+    )
+
+    created = 0
+    failed = 0
+    errors: List[schemas.ProductImportError] = []
+    known_category_ids: set = set()
+
+    def report(row_number: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append(schemas.ProductImportError(row=row_number, error=message))
+
+    def flush(chunk: List[Tuple[int, schemas.ProductCreate]]) -> None:
+        nonlocal created
+
+        unresolved = {product.category_id for _, product in chunk} - known_category_ids
+        if unresolved:
+            known_category_ids.update(
+                db.scalars(
+                    select(models.Category.id).where(models.Category.id.in_(unresolved))
+                )
+            )
+
+        values: List[Dict[str, Any]] = []
+        for row_number, product in chunk:
+            if product.category_id not in known_category_ids:
+                report(row_number, f"Category with id {product.category_id} not found.")
+            else:
+                values.append(product.model_dump())
+
+        if values:
+            db.execute(insert(models.Product), values)
+            db.commit()
+            created += len(values)
+
+    chunk: List[Tuple[int, schemas.ProductCreate]] = []
+
+    try:
+        for row_number, row in rows:
+            if isinstance(row, ValueError):
+                report(row_number, str(row))
+                continue
+            try:
+                chunk.append((row_number, schemas.ProductCreate.model_validate(row)))
+            except ValidationError as exc:
+                report(row_number, _format_validation_error(exc))
+                continue
+
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read the uploaded file after {created} created rows: {exc}",
+        )
+
+    if chunk:
+        flush(chunk)
+
+    return schemas.ProductImportResult(
+        created=created,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, case, cast, func, select, true, tuple_, Double
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Tuple
 
 from .. import models, schemas, dependencies
+from app.models.product import SEARCH_CONFIG
+from app.repositories import product as product_repository
 from app.schemas.error import APIError
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.cache import CachedProduct, product_cache
+from app.http_cache import (
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
 
 
 router = APIRouter(
@@ -13,15 +25,203 @@ router = APIRouter(
 )
 
 
+def _search_query(q: str):
+    """
+    Parses a user search string into a tsquery.
+    Supports quoted phrases, OR and -exclusions (web search syntax).
+    """
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def _search_rank(q: str):
+    """
+    Relevance of a product for the search string.
+    Cast to double precision so the value round-trips exactly through a cursor.
+    """
+    return cast(
+        func.ts_rank_cd(models.Product.search_vector, _search_query(q)),
+        Double,
+    )
+
+
+def _product_filters(category_id: Optional[int], q: Optional[str]) -> list:
+    """
+    Builds the WHERE criteria shared by the product listing endpoints.
+    The search term is matched against the GIN-indexed search vector.
+    """
+    filters = []
+
+    if category_id is not None:
+        filters.append(models.Product.category_id == category_id)
+
+    if q:
+        filters.append(models.Product.search_vector.op("@@")(_search_query(q)))
+
+    return filters
+
+
+def _product_page(
+    db: Session,
+    category_id: Optional[int],
+    q: Optional[str],
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> Tuple[list, Optional[str]]:
+    """
+    Loads one page of product summaries and the cursor for the next page.
+
+    Products are ordered by ID, or by search relevance (then ID) when `q`
+    is given. A cursor seeks past the last row of the previous page;
+    otherwise `skip` is applied as an offset.
+    """
+    query_db = (
+        db.query(models.Product)
+        .options(*product_repository.summary_options())
+        .filter(*_product_filters(category_id, q))
+    )
+
+    if q:
+        rank = _search_rank(q)
+        query_db = query_db.add_columns(rank).order_by(
+            rank.desc(), models.Product.id
+        )
+        if cursor is not None:
+            last_rank, last_id = decode_cursor(cursor, float, int)
+            query_db = query_db.filter(
+                or_(
+                    rank < last_rank,
+                    and_(rank == last_rank, models.Product.id > last_id),
+                )
+            )
+    else:
+        query_db = query_db.order_by(models.Product.id)
+        if cursor is not None:
+            (last_id,) = decode_cursor(cursor, int)
+            query_db = query_db.filter(models.Product.id > last_id)
+
+    if cursor is None:
+        query_db = query_db.offset(skip)
+
+    # Fetch one extra row to find out whether another page exists.
+    rows = query_db.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = (
+            encode_cursor(last[1], last[0].id) if q else encode_cursor(last.id)
+        )
+
+    products = [row[0] for row in rows] if q else rows
+    return products, next_cursor
+
+
+# Maximum number of ids accepted by the batch lookup.
+MAX_BATCH_IDS = 100
+
+# Upper bounds of the price ranges reported by the search facets.
+# The last range is open-ended.
+PRICE_BUCKET_BOUNDS = (
+    Decimal("25"),
+    Decimal("50"),
+    Decimal("100"),
+    Decimal("250"),
+    Decimal("500"),
+)
+
+
+def _product_facets(
+    db: Session,
+    category_id: Optional[int],
+    q: Optional[str],
+) -> schemas.ProductFacetsOut:
+    """
+    Computes the search facets with a single GROUPING SETS query.
+
+    Category counts only apply the search term, so the storefront can show
+    how many results each other category holds. Price buckets, the total
+    and the in-stock count apply all filters.
+    """
+    bucket = case(
+        *(
+            (models.Product.price < bound, index)
+            for index, bound in enumerate(PRICE_BUCKET_BOUNDS)
+        ),
+        else_=len(PRICE_BUCKET_BOUNDS),
+    )
+    in_category = (
+        models.Product.category_id == category_id
+        if category_id is not None
+        else true()
+    )
+
+    rows = db.execute(
+        select(
+            func.grouping(models.Category.id, bucket).label("grouping"),
+            models.Category.id,
+            models.Category.name,
+            bucket.label("bucket"),
+            func.count().label("search_count"),
+            func.count().filter(in_category).label("count"),
+            func.count()
+            .filter(and_(in_category, models.Product.stock > 0))
+            .label("in_stock"),
+        )
+        .join(models.Product.category)
+        .where(*_product_filters(None, q))
+        .group_by(
+            func.grouping_sets(
+                tuple_(models.Category.id, models.Category.name),
+                tuple_(bucket),
+                tuple_(),
+            )
+        )
+    ).all()
+
+    # GROUPING() sets a bit for every expression that is not grouped on.
+    categories = []
+    bucket_counts = [0] * (len(PRICE_BUCKET_BOUNDS) + 1)
+    total = in_stock = 0
+
+    for row in rows:
+        if row.grouping == 0b01:
+            categories.append(
+                schemas.CategoryFacetOut(
+                    category_id=row.id, name=row.name, count=row.search_count
+                )
+            )
+        elif row.grouping == 0b10:
+            bucket_counts[row.bucket] = row.count
+        else:
+            total, in_stock = row.count, row.in_stock
+
+    lower_bounds = (Decimal("0"),) + PRICE_BUCKET_BOUNDS
+    upper_bounds = PRICE_BUCKET_BOUNDS + (None,)
+
+    return schemas.ProductFacetsOut(
+        total=total,
+        in_stock=in_stock,
+        categories=sorted(categories, key=lambda facet: (-facet.count, facet.name)),
+        price_buckets=[
+            schemas.PriceBucketOut(min_price=low, max_price=high, count=count)
+            for low, high, count in zip(lower_bounds, upper_bounds, bucket_counts)
+        ],
+    )
+
+
 # -------------------------------------------------
 # GET all products (public)
 # -------------------------------------------------
 @router.get(
     "/",
-    response_model=List[schemas.ProductOut],
+    response_model=List[schemas.ProductSummaryOut],
     summary="Get All Products",
 )
 def get_all_public_products(
+    request: Request,
+    response: Response,
     db: Session = Depends(dependencies.get_db),
     category_id: Optional[int] = Query(
         default=None,
@@ -29,12 +229,16 @@ def get_all_public_products(
     ),
     q: Optional[str] = Query(
         default=None,
-        description="Search for product name or description"
+        description="Full-text search over product name and description"
     ),
     skip: int = Query(
         default=0,
         ge=0,
-        description="The number of items to skip"
+        description="The number of items to skip (ignored when a cursor is given)"
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
     ),
     limit: int = Query(
         default=100,
@@ -47,31 +251,137 @@ def get_all_public_products(
     Retrieves a list of all publicly available products.
 
     Supports optional filtering by category, search queries,
-    and pagination.
+    and pagination. Products are returned in their summary form;
+    use GET /products/{product_id} for reviews and full details.
+
+    Products are ordered by ID, or by search relevance when `q` is given.
+    When more products are available, the X-Next-Cursor response header
+    carries a cursor for the next page; passing it back as `cursor`
+    continues from the last product without scanning the skipped rows,
+    which keeps deep pages fast.
+
+    Responses carry a weak ETag derived from the id and version of every
+    product (and category) on the page; a matching If-None-Match is
+    answered with 304 Not Modified. There is no Last-Modified: the newest
+    row on a page says nothing about rows deleted from it or pushed off it.
     """
-    query_db = db.query(models.Product)
+    products, next_cursor = _product_page(db, category_id, q, cursor, skip, limit)
 
-    if category_id is not None:
-        query_db = query_db.filter(models.Product.category_id == category_id)
-
-    if q is not None:
-        search_term = f"%{q}%"
-        query_db = query_db.filter(
-            or_(
-                models.Product.name.ilike(search_term),
-                models.Product.description.ilike(search_term),
-            )
+    headers = {}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    etag = make_etag(
+        *(
+            f"{p.id}.{p.version}.{p.category.id}.{p.category.version}"
+            for p in products
         )
+    )
+    headers.update(cache_headers(etag, None))
+
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
 
-    products = query_db.offset(skip).limit(limit).all()
+    response.headers.update(headers)
     return products
 
 
+# -------------------------------------------------
+# GET faceted product search (public)
+# -------------------------------------------------
+@router.get(
+    "/search",
+    response_model=schemas.ProductSearchOut,
+    summary="Search Products with Facets",
+)
+def search_public_products(
+    db: Session = Depends(dependencies.get_db),
+    category_id: Optional[int] = Query(
+        default=None,
+        description="Filter products by category ID"
+    ),
+    q: Optional[str] = Query(
+        default=None,
+        description="Full-text search over product name and description"
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the next_cursor of the previous page"
+    ),
+    limit: int = Query(
+        default=24,
+        ge=1,
+        le=250,
+        description="The maximum number of items to return"
+    ),
+):
+    """
+    Returns a page of products together with the facets a storefront needs
+    to render its filters: per-category counts, price ranges and the number
+    of products in stock.
+
+    Accepts the same filters as GET /products/. The facets are computed in
+    one aggregate query next to the page query, instead of one listing
+    request per category.
+    """
+    products, next_cursor = _product_page(db, category_id, q, cursor, 0, limit)
+
+    return schemas.ProductSearchOut(
+        items=products,
+        next_cursor=next_cursor,
+        facets=_product_facets(db, category_id, q),
+    )
+
+
+# -------------------------------------------------
+# GET several products by ID (public)
+# -------------------------------------------------
+@router.get(
+    "/batch",
+    response_model=schemas.ProductBatchOut,
+    summary="Get Several Products by ID",
+)
+def get_public_products_batch(
+    db: Session = Depends(dependencies.get_db),
+    ids: List[int] = Query(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_IDS,
+        description=f"Product IDs to fetch (repeat the parameter, up to {MAX_BATCH_IDS})"
+    ),
+):
+    """
+    Retrieves the complete details for several products in one request.
+
+    The products are fetched with a single IN query; categories and reviews
+    are loaded with one additional query each. Products are returned in
+    the order of the requested ids (duplicates removed), and ids that do
+    not exist are listed in `missing`.
+    """
+    requested = list(dict.fromkeys(ids))
+
+    products = (
+        db.query(models.Product)
+        .options(
+            selectinload(models.Product.category),
+            selectinload(models.Product.reviews),
+        )
+        .filter(models.Product.id.in_(requested))
+        .all()
+    )
+    by_id = {product.id: product for product in products}
+
+    return schemas.ProductBatchOut(
+        items=[by_id[product_id] for product_id in requested if product_id in by_id],
+        missing=[product_id for product_id in requested if product_id not in by_id],
+    )
+
+
 # -------------------------------------------------
 # GET product by ID (public)
 # -------------------------------------------------
 @router.get(
-    "/{product_id}",
+    "/{product_id:int}",
     response_model=schemas.ProductOut,
     summary="Get a Single Product by ID",
     responses={
@@ -83,6 +393,7 @@ def get_all_public_products(
 )
 def get_public_product_by_id(
     product_id: int,
+    request: Request,
     db: Session = Depends(dependencies.get_db),
 ):
     """
@@ -92,9 +403,55 @@ def get_public_product_by_id(
     - Category information
     - All associated reviews
 
+    Rendered responses are kept in an in-process LRU cache keyed by product
+    id, which is invalidated whenever the product, its category or its
+    reviews change.
+
+    Supports conditional requests: a matching If-None-Match /
+    If-Modified-Since is answered with 304 Not Modified. On a cache miss
+    the product and category versions are checked first, so a 304 never
+    loads the reviews.
+
     Errors:
     - 404 Not Found if the product does not exist
     """
+    cached = product_cache.get(product_id)
+    if cached is not None:
+        if is_not_modified(request, cached.etag, cached.last_modified):
+            return not_modified_response(cached.headers)
+        return Response(
+            content=cached.body,
+            media_type="application/json",
+            headers=cached.headers,
+        )
+
+    generation = product_cache.generation
+
+    validators = (
+        db.query(
+            models.Product.version,
+            models.Product.updated_at,
+            models.Category.version,
+            models.Category.updated_at,
+        )
+        .join(models.Product.category)
+        .filter(models.Product.id == product_id)
+        .first()
+    )
+
+    if not validators:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with id {product_id} not found."
+        )
+
+    product_version, product_updated_at, category_version, category_updated_at = validators
+    etag = make_etag(product_id, product_version, category_version)
+    last_modified = max(product_updated_at, category_updated_at)
+
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(cache_headers(etag, last_modified))
+
     product = (
         db.query(models.Product)
         .options(
@@ -111,35 +468,179 @@ def get_public_product_by_id(
             detail=f"Product with id {product_id} not found."
         )
 
-    return product
+    # Validators are rebuilt from the loaded rows in case the product
+    # changed between the two queries.
+    etag = make_etag(product_id, product.version, product.category.version)
+    last_modified = max(product.updated_at, product.category.updated_at)
+    headers = cache_headers(etag, last_modified)
+    body = schemas.ProductOut.model_validate(product).model_dump_json().encode("utf-8")
+
+    product_cache.set(
+        product_id,
+        CachedProduct(body=body, etag=etag, last_modified=last_modified, headers=headers),
+        generation=generation,
+    )
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # -------------------------------------------------
 # GET reviews for a product (public)
 # -------------------------------------------------
+def _product_validators(db: Session, product_id: int):
+    """
+    Loads the version and modification time of a product, or raises 404.
+    """
+    validators = (
+        db.query(models.Product.version, models.Product.updated_at)
+        .filter(models.Product.id == product_id)
+        .first()
+    )
+
+    if not validators:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with id {product_id} not found."
+        )
+
+    return validators
+
+
 @router.get(
-    "/{product_id}/reviews",
+    "/{product_id:int}/reviews",
     response_model=List[schemas.ReviewOut],
     summary="Get Reviews for a Product",
 )
 def get_reviews_for_product(
     product_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(dependencies.get_db),
+    sort: schemas.ReviewSort = Query(
+        default=schemas.ReviewSort.NEWEST,
+        description="newest, highest or lowest rated first"
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    limit: int = Query(
+        default=20,
+        ge=1,
+        le=100,
+        description="The maximum number of reviews to return"
+    ),
 ):
     """
-    Retrieves all reviews for a specific product.
+    Retrieves one page of reviews for a specific product.
 
     This is a public endpoint and does not require authentication.
+    Reviews are sorted newest first, or by rating (newest first within a
+    rating). When more reviews are available, the X-Next-Cursor response
+    header carries the cursor for the next page.
+
+    New reviews bump the product version, so the product's validators
+    also serve conditional requests for its reviews.
 
     Errors:
     - 404 Not Found if the product does not exist
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    version, updated_at = _product_validators(db, product_id)
 
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id {product_id} not found."
+    headers = cache_headers(make_etag("reviews", product_id, version), updated_at)
+    if is_not_modified(request, headers["ETag"], updated_at):
+        return not_modified_response(headers)
+
+    review = models.Review
+    query_db = db.query(review).filter(review.product_id == product_id)
+
+    if sort == schemas.ReviewSort.NEWEST:
+        query_db = query_db.order_by(review.created_at.desc(), review.id.desc())
+    elif sort == schemas.ReviewSort.HIGHEST:
+        query_db = query_db.order_by(
+            review.rating.desc(), review.created_at.desc(), review.id.desc()
+        )
+    else:
+        query_db = query_db.order_by(
+            review.rating, review.created_at.desc(), review.id.desc()
         )
 
-    return product.reviews
+    if cursor is not None:
+        last_rating, last_created_at, last_id = decode_cursor(
+            cursor, int, datetime.fromisoformat, int
+        )
+        newer_first = tuple_(review.created_at, review.id) < tuple_(last_created_at, last_id)
+
+        if sort == schemas.ReviewSort.NEWEST:
+            query_db = query_db.filter(newer_first)
+        elif sort == schemas.ReviewSort.HIGHEST:
+            query_db = query_db.filter(
+                or_(
+                    review.rating < last_rating,
+                    and_(review.rating == last_rating, newer_first),
+                )
+            )
+        else:
+            query_db = query_db.filter(
+                or_(
+                    review.rating > last_rating,
+                    and_(review.rating == last_rating, newer_first),
+                )
+            )
+
+    # Fetch one extra row to find out whether another page exists.
+    reviews = query_db.limit(limit + 1).all()
+
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.rating, last.created_at, last.id)
+
+    response.headers.update(headers)
+    return reviews
+
+
+# -------------------------------------------------
+# GET review summary for a product (public)
+# -------------------------------------------------
+@router.get(
+    "/{product_id:int}/reviews/summary",
+    response_model=schemas.ReviewSummaryOut,
+    summary="Get the Rating Histogram for a Product",
+)
+def get_review_summary_for_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(dependencies.get_db),
+):
+    """
+    Returns the number of reviews, the average rating and a 1-5 star
+    histogram for a product, computed with one aggregate query.
+
+    Errors:
+    - 404 Not Found if the product does not exist
+    """
+    version, updated_at = _product_validators(db, product_id)
+
+    headers = cache_headers(make_etag("review-summary", product_id, version), updated_at)
+    if is_not_modified(request, headers["ETag"], updated_at):
+        return not_modified_response(headers)
+
+    counts = dict(
+        db.query(models.Review.rating, func.count())
+        .filter(models.Review.product_id == product_id)
+        .group_by(models.Review.rating)
+        .all()
+    )
+
+    review_count = sum(counts.values())
+    rating_sum = sum(rating * count for rating, count in counts.items())
+
+    response.headers.update(headers)
+    return schemas.ReviewSummaryOut(
+        product_id=product_id,
+        review_count=review_count,
+        average_rating=rating_sum / review_count if review_count else None,
+        histogram={rating: counts.get(rating, 0) for rating in range(1, 6)},
+    )
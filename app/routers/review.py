@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from .. import models, schemas, dependencies
+from app.cache import product_cache
 
 # Create a new router instance for review-related endpoints.
 router = APIRouter(
@@ -62,13 +63,26 @@ def create_review(
     # 4. Handle the unique constraint for duplicate reviews (existing logic).
     try:
         db.add(new_review)
-        db.commit()
-        db.refresh(new_review)
+        db.flush()
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="You have already submitted a review for this product."
         )
-    
-    return new_review
\ No newline at end of file
+
+    # 5. Update the product's rating aggregates in the same transaction,
+    # so reading the average rating never has to scan the reviews.
+    db.query(models.Product).filter(models.Product.id == product.id).update(
+        {
+            models.Product.review_count: models.Product.review_count + 1,
+            models.Product.rating_sum: models.Product.rating_sum + new_review.rating,
+        },
+        synchronize_session=False,
+    )
+
+    db.commit()
+    product_cache.invalidate(product.id)
+    db.refresh(new_review)
+
+    return new_review
@@ -8,18 +8,51 @@ from .category import CategoryCreate, CategoryOut
 from .product import (
     ProductCreate,
     ProductOut,
+    ProductSummaryOut,
     ProductUpdate,
+    ProductBatchOut,
+    ProductSearchOut,
+    ProductFacetsOut,
+    CategoryFacetOut,
+    PriceBucketOut,
+    ProductFileFormat,
+    ProductImportError,
+    ProductImportResult,
 )
 
 # cart
-from .cart import CartOut, CartItemOut, CartItemAdd, CartItemUpdate
+from .cart import (
+    CartOut,
+    CartItemOut,
+    CartItemAdd,
+    CartItemUpdate,
+    CartItemOperation,
+    CartItemOperationType,
+)
 
 from .order import (
     OrderOut,
     OrderItemOut,        
     AdminOrderOut,
     OrderStatusUpdate,
+    OrderExpand,
+    OrderCount,
+    OrderBulkFilter,
+    OrderBulkStatusUpdate,
+    OrderStatusChangeOutcome,
+    OrderStatusChangeResult,
+    OrderBulkStatusResult,
+    MAX_BULK_ORDER_IDS,
 )
 
+# fulfillment queue
+from .fulfillment import FulfillmentClaimOut, FulfillmentOrderIds, FulfillmentBatchOut
+
 # reviews
-from .review import ReviewOut, ReviewCreate
+from .review import ReviewOut, ReviewCreate, ReviewSort, ReviewSummaryOut
+
+# caching
+from .cache import CacheStatsOut
+
+# sales analytics
+from .analytics import DailySalesOut, ProductSalesOut, CategorySalesOut
@@ -0,0 +1,42 @@
+# app/schemas/analytics.py
+
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DailySalesOut(BaseModel):
+    sales_date: date
+    units_sold: int
+    revenue: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductSalesOut(BaseModel):
+    """
+    Sales of one product over the requested days. `order_count` is the
+    number of orders that included it.
+    """
+    product_id: int
+    product_name: str
+    units_sold: int
+    revenue: Decimal
+    order_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CategorySalesOut(BaseModel):
+    """
+    Sales of one category over the requested days. `order_count` is the
+    number of orders with at least one product of the category.
+    """
+    category_id: int
+    category_name: str
+    units_sold: int
+    revenue: Decimal
+    order_count: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,15 @@
+# app/schemas/cache.py
+
+from pydantic import BaseModel
+
+
+class CacheStatsOut(BaseModel):
+    """
+    Usage counters of an in-process cache.
+    """
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
@@ -1,7 +1,9 @@
 # app/schemas/cart.py
 
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List
+import enum
+
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Optional
 from decimal import Decimal
 # Import ProductOut schema to nest product details within the cart item response.
 from .product import ProductOut
@@ -46,4 +48,26 @@ class CartItemUpdate(BaseModel):
     """
     # Just like when adding, the quantity must be a positive integer.
     # We enforce this with Pydantic's Field validation.
-    quantity: int = Field(gt=0, description="The new quantity for the cart item.")
\ No newline at end of file
+    quantity: int = Field(gt=0, description="The new quantity for the cart item.")
+
+
+class CartItemOperationType(str, enum.Enum):
+    SET = "set"
+    ADD = "add"
+    REMOVE = "remove"
+
+
+class CartItemOperation(CartItemAdd):
+    """
+    One line of a bulk cart mutation. `set` replaces the quantity of the
+    line, `add` increments it and `remove` deletes the line.
+    """
+    op: CartItemOperationType = CartItemOperationType.SET
+    # Required for `set` and `add`, ignored for `remove`.
+    quantity: Optional[int] = Field(default=None, gt=0, description="The quantity to set or add.")
+
+    @model_validator(mode="after")
+    def check_quantity(self) -> "CartItemOperation":
+        if self.op != CartItemOperationType.REMOVE and self.quantity is None:
+            raise ValueError(f"quantity is required for the '{self.op.value}' operation")
+        return self
@@ -0,0 +1,34 @@
+# app/schemas/fulfillment.py
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .order import AdminOrderOut
+
+
+# Upper bound on the number of orders acknowledged or released at once.
+MAX_FULFILLMENT_BATCH = 1000
+
+
+class FulfillmentClaimOut(BaseModel):
+    """
+    Orders leased to the caller, oldest first. The lease ends at
+    `lease_expires_at`, after which other workers may claim them.
+    """
+    lease_expires_at: Optional[datetime] = None
+    orders: List[AdminOrderOut]
+
+
+class FulfillmentOrderIds(BaseModel):
+    order_ids: List[int] = Field(min_length=1, max_length=MAX_FULFILLMENT_BATCH)
+
+
+class FulfillmentBatchOut(BaseModel):
+    """
+    `succeeded` lists the orders processed; `rejected` the ones the caller
+    does not hold a live lease on.
+    """
+    succeeded: List[int]
+    rejected: List[int]
@@ -1,35 +1,76 @@
 # app/schemas/order.py
 
-from pydantic import BaseModel, ConfigDict
-from typing import List
+import enum
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
 # We need the ProductOut schema to nest product details within the order item response.
 from .product import ProductOut
 from .user import UserOut
-from ..models import OrderStatus
+from ..models import Order, OrderItem, OrderStatus
+
+
+class OrderExpand(str, enum.Enum):
+    PRODUCT = "product"
+
+
+class OrderCount(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
 
 
 # --- Order Item Schema ---
 # This schema defines the structure for a single item within a created order.
+# Name and price are snapshots taken at checkout; the live product is only
+# included when the caller asks for `expand=product`.
 class OrderItemOut(BaseModel):
-    product: ProductOut
+    product_id: int
+    product_name: str
     quantity: int
     price_at_purchase: Decimal
+    product: Optional[ProductOut] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_item(cls, item: OrderItem, expand_product: bool = False) -> "OrderItemOut":
+        return cls(
+            product_id=item.product_id,
+            product_name=item.product_name,
+            quantity=item.quantity,
+            price_at_purchase=item.price,
+            product=item.product if expand_product else None,
+        )
+
 # --- Order Schema ---
 # This schema represents the entire order.
 class OrderOut(BaseModel):
     id: int
     total_price: Decimal
+    item_count: int
     status: OrderStatus
     items: List[OrderItemOut]
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_order(cls, order: Order, expand_product: bool = False, **fields):
+        """
+        Builds the response from the stored totals and line snapshots.
+        Extra `fields` are passed through for subclasses.
+        """
+        return cls(
+            id=order.id,
+            status=order.status,
+            total_price=order.total_price,
+            item_count=order.item_count,
+            items=[OrderItemOut.from_item(item, expand_product) for item in order.items],
+            **fields,
+        )
+
 
 
 class AdminOrderOut(OrderOut):
@@ -41,4 +82,64 @@ class AdminOrderOut(OrderOut):
 
 class OrderStatusUpdate(BaseModel):
     
-    status: OrderStatus
\ No newline at end of file
+    status: OrderStatus
+
+
+# Upper bound on the number of explicit order ids in one bulk update.
+MAX_BULK_ORDER_IDS = 10000
+
+
+class OrderBulkFilter(BaseModel):
+    """
+    Selects orders for a bulk update; `date_to` is exclusive.
+    """
+    status: Optional[OrderStatus] = None
+    user_id: Optional[int] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "OrderBulkFilter":
+        if all(getattr(self, name) is None for name in type(self).model_fields):
+            raise ValueError("the filter needs at least one criterion")
+        return self
+
+
+class OrderBulkStatusUpdate(OrderStatusUpdate):
+    """
+    Moves either the listed orders or every order matching `filter` to
+    `status`.
+    """
+    order_ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=MAX_BULK_ORDER_IDS)
+    filter: Optional[OrderBulkFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "OrderBulkStatusUpdate":
+        if (self.order_ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of order_ids and filter")
+        return self
+
+
+class OrderStatusChangeOutcome(str, enum.Enum):
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    INVALID_TRANSITION = "invalid_transition"
+    NOT_FOUND = "not_found"
+
+
+class OrderStatusChangeResult(BaseModel):
+    order_id: int
+    # The status before the request; None if the order does not exist.
+    previous_status: Optional[OrderStatus] = None
+    result: OrderStatusChangeOutcome
+
+
+class OrderBulkStatusResult(BaseModel):
+    """
+    `has_more` is set when a filter matched more than MAX_BULK_ORDER_IDS
+    orders that can make the transition; repeat the request to continue.
+    """
+    status: OrderStatus
+    updated: int
+    results: List[OrderStatusChangeResult]
+    has_more: bool = False
@@ -1,3 +1,4 @@
+import enum
 from pydantic import BaseModel, Field, ConfigDict
 from decimal import Decimal
 from typing import List, Optional
@@ -60,5 +61,81 @@ class ProductOut(ProductBase):
     category: CategoryOut
     reviews: List[ReviewOut] = []
     average_rating: Optional[float] = None
+    review_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductSummaryOut(BaseModel):
+    """
+    Compact product representation used by list endpoints.
+    Reviews are not embedded; only their aggregates are exposed.
+    """
+    id: int
+    name: str
+    price: Decimal
+    stock: int
+    category: CategoryOut
+    average_rating: Optional[float] = None
+    review_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBatchOut(BaseModel):
+    """
+    Products found by a batch lookup, in request order, and the ids that were not found.
+    """
+    items: List[ProductOut]
+    missing: List[int] = []
+
+
+class CategoryFacetOut(BaseModel):
+    category_id: int
+    name: str
+    count: int
+
+
+class PriceBucketOut(BaseModel):
+    """
+    A price range [min_price, max_price); max_price is None for the last range.
+    """
+    min_price: Decimal
+    max_price: Optional[Decimal] = None
+    count: int
+
+
+class ProductFacetsOut(BaseModel):
+    total: int
+    in_stock: int
+    categories: List[CategoryFacetOut]
+    price_buckets: List[PriceBucketOut]
+
+
+class ProductSearchOut(BaseModel):
+    """
+    A page of search results together with the facets for the whole result set.
+    """
+    items: List[ProductSummaryOut]
+    next_cursor: Optional[str] = None
+    facets: ProductFacetsOut
+
+
+class ProductFileFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ProductImportError(BaseModel):
+    row: int
+    error: str
+
+
+class ProductImportResult(BaseModel):
+    """
+    Outcome of a bulk product import. Row numbers count data rows from 1.
+    """
+    created: int
+    failed: int
+    errors: List[ProductImportError]
+    errors_truncated: bool = False
@@ -1,7 +1,8 @@
 # app/schemas/review.py
 
+import enum
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 from .user import UserOut
@@ -33,3 +34,20 @@ class ReviewOut(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewSort(str, enum.Enum):
+    NEWEST = "newest"
+    HIGHEST = "highest"
+    LOWEST = "lowest"
+
+
+class ReviewSummaryOut(BaseModel):
+    """
+    Aggregated ratings of a product; `histogram` maps each star rating
+    from 1 to 5 to its number of reviews.
+    """
+    product_id: int
+    review_count: int
+    average_rating: Optional[float] = None
+    histogram: Dict[int, int]
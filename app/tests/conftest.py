@@ -3,13 +3,16 @@ import uuid
 from typing import Generator
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app import models
 from app.main import app
 from app.security import hash_password
 from app.dependencies import get_db
+from app.cache import product_cache
 from app.database_test import (
+    engine,
     TestingSessionLocal,
     create_test_database,
     drop_test_database,
@@ -27,6 +30,16 @@ def setup_test_db() -> Generator[None, None, None]:
     drop_test_database()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_product_cache() -> Generator[None, None, None]:
+    """
+    Keeps cached product payloads from leaking between tests.
+    """
+    product_cache.clear()
+    yield
+    product_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     """
@@ -47,6 +60,24 @@ def db_session() -> Generator[Session, None, None]:
 
 
 
+@pytest.fixture(scope="function")
+def query_counter() -> Generator[list, None, None]:
+    """
+    Records every SQL statement executed against the test database,
+    so tests can assert on the number of queries an endpoint issues.
+    """
+    statements: list = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
 # -------------------------------------------------------------------
 # Users
 # -------------------------------------------------------------------
@@ -0,0 +1,147 @@
+# app/tests/test_analytics.py
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.repositories import analytics as analytics_repository
+
+
+def _place_order(client: TestClient, product_id: int, quantity: int) -> int:
+    response = client.post(
+        "/cart/items", json={"product_id": product_id, "quantity": quantity}
+    )
+    assert response.status_code == 201
+
+    response = client.post("/orders/")
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_rollups_follow_checkout_and_cancellation(
+    authenticated_client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+    test_category: models.Category,
+):
+    product_id, category_id = test_product.id, test_category.id
+
+    _place_order(authenticated_client, product_id, 2)
+    cancelled_id = _place_order(authenticated_client, product_id, 3)
+
+    response = admin_authenticated_client.patch(
+        f"/admin/orders/{cancelled_id}", json={"status": "cancelled"}
+    )
+    assert response.status_code == 200
+
+    daily = admin_authenticated_client.get("/admin/analytics/sales/daily")
+    assert daily.status_code == 200
+    assert daily.json() == [
+        {
+            "sales_date": datetime.now(timezone.utc).date().isoformat(),
+            "units_sold": 2,
+            "revenue": "199.98",
+        }
+    ]
+
+    products = admin_authenticated_client.get(
+        "/admin/analytics/sales/products", params={"category_id": category_id}
+    )
+    assert products.json() == [
+        {
+            "product_id": product_id,
+            "product_name": "Test Product",
+            "units_sold": 2,
+            "revenue": "199.98",
+            "order_count": 1,
+        }
+    ]
+
+    (category,) = admin_authenticated_client.get(
+        "/admin/analytics/sales/categories"
+    ).json()
+    assert category["category_id"] == category_id
+    assert category["order_count"] == 1
+
+
+def test_cancellation_leaves_the_checkout_category(
+    authenticated_client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+    test_category: models.Category,
+    db_session: Session,
+):
+    order_id = _place_order(authenticated_client, test_product.id, 1)
+
+    moved_to = models.Category(name="Moved")
+    db_session.add(moved_to)
+    db_session.flush()
+    test_product.category_id = moved_to.id
+    db_session.commit()
+
+    response = admin_authenticated_client.patch(
+        f"/admin/orders/{order_id}", json={"status": "cancelled"}
+    )
+    assert response.status_code == 200
+
+    rows = {
+        row.category_id: row.units_sold
+        for row in db_session.query(models.DailyCategorySales)
+    }
+    assert rows == {test_category.id: 0}
+
+
+def test_rebuild_sales_recomputes_from_order_history(
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+):
+    order_date = datetime(2026, 2, 10, 23, 30, tzinfo=timezone.utc)
+    for order_status, quantity in [
+        (models.OrderStatus.PAID, 1),
+        (models.OrderStatus.DELIVERED, 4),
+        (models.OrderStatus.CANCELLED, 7),
+    ]:
+        order = models.Order(
+            user_id=test_user.id,
+            order_date=order_date,
+            status=order_status,
+            total_price=10 * quantity,
+            item_count=quantity,
+        )
+        db_session.add(order)
+        db_session.flush()
+        db_session.add(
+            models.OrderItem(
+                order_id=order.id,
+                order_date=order_date,
+                product_id=test_product.id,
+                product_name=test_product.name,
+                category_id=test_product.category_id,
+                quantity=quantity,
+                price=10,
+            )
+        )
+    db_session.commit()
+
+    rows = analytics_repository.rebuild_sales(
+        db_session, date_from=date(2026, 2, 1), date_to=date(2026, 2, 28)
+    )
+    db_session.commit()
+
+    assert rows == 1
+    (product_sales,) = analytics_repository.top_products(
+        db_session, date(2026, 2, 10), date(2026, 2, 10), limit=10
+    )
+    assert product_sales.units_sold == 5
+    assert product_sales.revenue == Decimal("50.00")
+    assert product_sales.order_count == 2
+
+    # Rebuilding again leaves the totals unchanged.
+    analytics_repository.rebuild_sales(db_session, date_from=date(2026, 2, 10))
+    assert analytics_repository.daily_sales(
+        db_session, date(2026, 2, 1), date(2026, 2, 28)
+    )[0].units_sold == 5
@@ -0,0 +1,101 @@
+# app/tests/test_cache.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.cache import LRUCache
+
+
+# -------------------------------------------------
+# LRUCache unit tests
+# -------------------------------------------------
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(max_entries=2, ttl_seconds=0)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_lru_cache_drops_values_read_before_an_invalidation():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+
+    assert cache.get("a") is None
+
+
+# -------------------------------------------------
+# Product detail caching
+# -------------------------------------------------
+def test_product_detail_is_cached_and_invalidated_by_reviews(
+    client: TestClient,
+    authenticated_client: TestClient,
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+    query_counter: list,
+):
+    product_id, category_id = test_product.id, test_product.category_id
+
+    first = client.get(f"/products/{product_id}")
+    assert first.status_code == 200
+
+    query_counter.clear()
+    second = client.get(f"/products/{product_id}")
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert query_counter == []
+
+    # A new review invalidates the cached payload.
+    order = models.Order(user_id=test_user.id)
+    db_session.add(order)
+    db_session.flush()
+    db_session.add(
+        models.OrderItem(
+            order_id=order.id,
+            order_date=order.order_date,
+            product_id=product_id,
+            quantity=1,
+            price=99.99,
+            product_name="Test Product",
+            category_id=category_id,
+        )
+    )
+    db_session.commit()
+
+    review = authenticated_client.post(
+        "/reviews/", json={"product_id": product_id, "rating": 4}
+    )
+    assert review.status_code == 201
+
+    third = client.get(f"/products/{product_id}")
+    assert len(third.json()["reviews"]) == 1
+    assert third.json()["average_rating"] == 4
+    assert third.headers["ETag"] != first.headers["ETag"]
+
+
+def test_admin_can_read_product_cache_stats(admin_authenticated_client: TestClient):
+    response = admin_authenticated_client.get("/admin/cache/products")
+
+    assert response.status_code == 200
+    assert {"size", "hits", "misses", "evictions"} <= response.json().keys()
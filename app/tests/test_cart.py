@@ -172,3 +172,169 @@ def test_add_more_than_available_stock_fails(
     assert "Insufficient stock" in response.json()["detail"]
 
 
+
+
+def test_view_cart_query_count_does_not_grow_with_lines(
+    authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+    query_counter: list,
+):
+    """
+    Viewing the cart loads items, products, categories and reviews in a
+    fixed number of queries, however many lines the cart holds.
+    """
+    products = [
+        models.Product(name=f"Cart Product {i}", price=10 + i, stock=10, category_id=test_category.id)
+        for i in range(5)
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    product_ids = [product.id for product in products]
+
+    def count_cart_queries() -> int:
+        db_session.expire_all()
+        query_counter.clear()
+        response = authenticated_client.get("/cart/")
+        assert response.status_code == 200
+        return len(query_counter)
+
+    authenticated_client.post("/cart/items", json={"product_id": product_ids[0], "quantity": 1})
+    single_line_queries = count_cart_queries()
+
+    for product_id in product_ids[1:]:
+        authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 2})
+    many_lines_queries = count_cart_queries()
+
+    assert many_lines_queries == single_line_queries
+    assert many_lines_queries <= 5
+
+    response = authenticated_client.get("/cart/")
+    assert len(response.json()["items"]) == 5
+    assert float(response.json()["total_price"]) == 10 + 2 * (11 + 12 + 13 + 14)
+
+
+def test_add_item_twice_increments_within_stock(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+):
+    """
+    Adding an existing line increments its quantity in place, and the
+    stock check applies to the combined quantity.
+    """
+    product_id = test_product.id
+    stock = test_product.stock
+
+    first = authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": stock - 1})
+    second = authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.json()["quantity"] == stock
+
+    over = authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+    assert over.status_code == 400
+    assert "Insufficient stock" in over.json()["detail"]
+
+    (item,) = authenticated_client.get("/cart/").json()["items"]
+    assert item["quantity"] == stock
+
+
+def test_add_item_again_while_other_carts_have_lines(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+    admin_user: models.User,
+    db_session: Session,
+):
+    """
+    The stock check of an existing line only looks at that line's
+    product, however many lines other carts hold.
+    """
+    product_id = test_product.id
+    other_product = models.Product(
+        name="Other Product", price=5, stock=10, category_id=test_product.category_id
+    )
+    db_session.add(other_product)
+    db_session.flush()
+
+    other_cart = models.Cart(user_id=admin_user.id)
+    db_session.add(other_cart)
+    db_session.flush()
+    db_session.add_all([
+        models.CartItem(cart_id=other_cart.id, product_id=product_id, quantity=1),
+        models.CartItem(cart_id=other_cart.id, product_id=other_product.id, quantity=2),
+    ])
+    db_session.commit()
+
+    authenticated_client.post("/cart/items", json={"product_id": other_product.id, "quantity": 1})
+    first = authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+    again = authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 2})
+
+    assert first.status_code == 201
+    assert again.status_code == 201
+    assert again.json()["quantity"] == 3
+
+
+def test_add_unknown_product_to_cart_fails(authenticated_client: TestClient):
+    response = authenticated_client.post("/cart/items", json={"product_id": 999999, "quantity": 1})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Product not found"
+
+
+def test_bulk_update_cart_items(
+    authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    """
+    PATCH /cart/items applies set, add and remove operations in order
+    and returns the resulting cart.
+    """
+    kept, added, removed = [
+        models.Product(name=f"Bulk Cart Product {i}", price=10, stock=5, category_id=test_category.id)
+        for i in range(3)
+    ]
+    db_session.add_all([kept, added, removed])
+    db_session.commit()
+    kept_id, added_id, removed_id = kept.id, added.id, removed.id
+
+    authenticated_client.post("/cart/items", json={"product_id": kept_id, "quantity": 1})
+    authenticated_client.post("/cart/items", json={"product_id": removed_id, "quantity": 1})
+
+    response = authenticated_client.patch("/cart/items", json=[
+        {"product_id": kept_id, "op": "add", "quantity": 2},
+        {"product_id": added_id, "op": "set", "quantity": 4},
+        {"product_id": removed_id, "op": "remove"},
+    ])
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {item["product"]["id"]: item["quantity"] for item in data["items"]} == {
+        kept_id: 3,
+        added_id: 4,
+    }
+    assert float(data["total_price"]) == 70
+
+
+def test_bulk_update_cart_items_is_all_or_nothing(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+):
+    product_id = test_product.id
+    authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+
+    response = authenticated_client.patch("/cart/items", json=[
+        {"product_id": product_id, "op": "set", "quantity": 2},
+        {"product_id": product_id, "op": "add", "quantity": test_product.stock},
+    ])
+    assert response.status_code == 400
+    assert "Insufficient stock" in response.json()["detail"]
+
+    missing_quantity = authenticated_client.patch("/cart/items", json=[
+        {"product_id": product_id, "op": "add"},
+    ])
+    assert missing_quantity.status_code == 422
+
+    (item,) = authenticated_client.get("/cart/").json()["items"]
+    assert item["quantity"] == 1
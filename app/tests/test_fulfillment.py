@@ -0,0 +1,110 @@
+# app/tests/test_fulfillment.py
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def _create_orders(db_session: Session, user: models.User, statuses) -> list:
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    orders = [
+        models.Order(
+            user_id=user.id,
+            order_date=start + timedelta(minutes=i),
+            status=order_status,
+            total_price=10,
+            item_count=1,
+        )
+        for i, order_status in enumerate(statuses)
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+    return orders
+
+
+def test_claim_hands_out_each_paid_order_once(
+    admin_authenticated_client: TestClient,
+    test_user: models.User,
+    db_session: Session,
+):
+    oldest, pending, newer, newest = _create_orders(
+        db_session,
+        test_user,
+        [
+            models.OrderStatus.PAID,
+            models.OrderStatus.PENDING,
+            models.OrderStatus.PAID,
+            models.OrderStatus.PAID,
+        ],
+    )
+
+    first = admin_authenticated_client.post("/admin/fulfillment/claim", params={"limit": 2})
+    second = admin_authenticated_client.post("/admin/fulfillment/claim", params={"limit": 2})
+
+    assert first.status_code == 200
+    assert [order["id"] for order in first.json()["orders"]] == [oldest.id, newer.id]
+    assert first.json()["lease_expires_at"] is not None
+    assert [order["id"] for order in second.json()["orders"]] == [newest.id]
+
+    empty = admin_authenticated_client.post("/admin/fulfillment/claim")
+    assert empty.json() == {"lease_expires_at": None, "orders": []}
+
+
+def test_ack_ships_held_orders_and_release_requeues(
+    admin_authenticated_client: TestClient,
+    admin_user: models.User,
+    test_user: models.User,
+    db_session: Session,
+):
+    shipped, released, unclaimed = _create_orders(
+        db_session, test_user, [models.OrderStatus.PAID] * 3
+    )
+    admin_authenticated_client.post("/admin/fulfillment/claim", params={"limit": 2})
+
+    ack = admin_authenticated_client.post(
+        "/admin/fulfillment/ack", json={"order_ids": [shipped.id, unclaimed.id]}
+    )
+    assert ack.json() == {"succeeded": [shipped.id], "rejected": [unclaimed.id]}
+
+    release = admin_authenticated_client.post(
+        "/admin/fulfillment/release", json={"order_ids": [released.id]}
+    )
+    assert release.json() == {"succeeded": [released.id], "rejected": []}
+
+    db_session.expire_all()
+    shipped_order = db_session.get(models.Order, shipped.id)
+    assert shipped_order.status == models.OrderStatus.SHIPPED
+    assert shipped_order.claimed_by is None
+
+    (history,) = db_session.query(models.OrderStatusHistory).all()
+    assert (history.order_id, history.changed_by) == (shipped.id, admin_user.id)
+
+    reclaimed = admin_authenticated_client.post("/admin/fulfillment/claim")
+    assert [order["id"] for order in reclaimed.json()["orders"]] == [released.id, unclaimed.id]
+
+
+def test_admin_status_changes_end_the_lease(
+    admin_authenticated_client: TestClient,
+    test_user: models.User,
+    db_session: Session,
+):
+    patched, bulk = _create_orders(db_session, test_user, [models.OrderStatus.PAID] * 2)
+    admin_authenticated_client.post("/admin/fulfillment/claim")
+
+    response = admin_authenticated_client.patch(
+        f"/admin/orders/{patched.id}", json={"status": "shipped"}
+    )
+    assert response.status_code == 200
+
+    response = admin_authenticated_client.post(
+        "/admin/orders/status", json={"status": "cancelled", "order_ids": [bulk.id]}
+    )
+    assert response.json()["updated"] == 1
+
+    db_session.expire_all()
+    for order_id in (patched.id, bulk.id):
+        order = db_session.get(models.Order, order_id)
+        assert (order.claimed_by, order.lease_expires_at) == (None, None)
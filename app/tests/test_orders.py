@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app import models
@@ -85,6 +87,36 @@ def test_create_order_insufficient_stock_fails(
 
 
 
+def test_create_order_reports_each_short_product(
+    authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    """
+    When only some lines can be fulfilled the whole checkout fails, and
+    the error names the short product with the requested and available
+    quantities.
+    """
+    plenty = models.Product(name="Plenty", price=5, stock=10, category_id=test_category.id)
+    scarce = models.Product(name="Scarce", price=5, stock=3, category_id=test_category.id)
+    db_session.add_all([plenty, scarce])
+    db_session.commit()
+    plenty_id, scarce_id = plenty.id, scarce.id
+
+    authenticated_client.post("/cart/items", json={"product_id": plenty_id, "quantity": 2})
+    authenticated_client.post("/cart/items", json={"product_id": scarce_id, "quantity": 3})
+
+    scarce.stock = 1
+    db_session.commit()
+
+    response = authenticated_client.post("/orders/")
+
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert f"product {scarce_id}: requested 3, available 1" in detail
+    assert f"product {plenty_id}" not in detail
+
+
 def test_get_user_orders_success(
     authenticated_client: TestClient,
     test_product: models.Product,
@@ -100,7 +132,7 @@ def test_get_user_orders_success(
 
     orders = response.json()
     assert len(orders) == 1
-    assert orders[0]["items"][0]["product"]["id"] == test_product.id
+    assert orders[0]["items"][0]["product_id"] == test_product.id
 
 
 def test_user_cannot_access_other_users_order(
@@ -117,3 +149,335 @@ def test_user_cannot_access_other_users_order(
 
     response = authenticated_client.get(f"/orders/{admin_order_id}")
     assert response.status_code == 403
+
+
+def test_order_totals_are_stored_at_checkout(
+    authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    first = models.Product(name="Totals A", price="2.50", stock=10, category_id=test_category.id)
+    second = models.Product(name="Totals B", price="10.00", stock=10, category_id=test_category.id)
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    authenticated_client.post("/cart/items", json={"product_id": first.id, "quantity": 4})
+    authenticated_client.post("/cart/items", json={"product_id": second.id, "quantity": 1})
+    response = authenticated_client.post("/orders/")
+
+    assert response.status_code == 201
+    assert float(response.json()["total_price"]) == 20
+    assert response.json()["item_count"] == 5
+
+    order = db_session.get(models.Order, response.json()["id"])
+    assert float(order.total_price) == 20
+    assert order.item_count == 5
+
+    (listed,) = authenticated_client.get("/orders/").json()
+    assert float(listed["total_price"]) == 20
+    assert len(listed["items"]) == 2
+
+
+def test_order_lines_are_snapshots_unless_expanded(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+    db_session: Session,
+    query_counter: list,
+):
+    """
+    Order history shows the name and price captured at checkout without
+    loading products; `expand=product` embeds the live product instead.
+    """
+    product_id = test_product.id
+    authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+    order_id = authenticated_client.post("/orders/").json()["id"]
+
+    test_product.name = "Renamed Product"
+    db_session.commit()
+
+    query_counter.clear()
+    response = authenticated_client.get(f"/orders/{order_id}")
+    assert response.status_code == 200
+    assert not any("FROM products" in statement for statement in query_counter)
+
+    (line,) = response.json()["items"]
+    assert line["product_name"] == "Test Product"
+    assert line["product"] is None
+
+    expanded = authenticated_client.get(f"/orders/{order_id}", params={"expand": "product"})
+    (line,) = expanded.json()["items"]
+    assert line["product_name"] == "Test Product"
+    assert line["product"]["name"] == "Renamed Product"
+
+
+def test_admin_can_list_orders(
+    authenticated_client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+):
+    authenticated_client.post("/cart/items", json={"product_id": test_product.id, "quantity": 2})
+    order_id = authenticated_client.post("/orders/").json()["id"]
+
+    response = admin_authenticated_client.get("/admin/orders/")
+
+    assert response.status_code == 200
+    (order,) = [order for order in response.json() if order["id"] == order_id]
+    assert order["item_count"] == 2
+    assert order["items"][0]["product_name"] == "Test Product"
+    assert "email" in order["user"]
+
+
+def test_order_history_is_paginated_and_filtered(
+    authenticated_client: TestClient,
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+    query_counter: list,
+):
+    """
+    Order history walks newest first with X-Next-Cursor, loads each page
+    in a fixed number of queries and honours the status and date filters.
+    """
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    orders = [
+        models.Order(
+            user_id=test_user.id,
+            order_date=start + timedelta(days=i),
+            status=models.OrderStatus.SHIPPED if i % 2 else models.OrderStatus.PENDING,
+            total_price=test_product.price,
+            item_count=1,
+            items=[
+                models.OrderItem(
+                    product_id=test_product.id,
+                    product_name=test_product.name,
+                    category_id=test_product.category_id,
+                    quantity=1,
+                    price=test_product.price,
+                )
+            ],
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+    newest_first = [order.id for order in reversed(orders)]
+
+    seen = []
+    page_queries = []
+    params = {"limit": 2}
+    while True:
+        query_counter.clear()
+        response = authenticated_client.get("/orders/", params=params)
+        assert response.status_code == 200
+        page_queries.append(len(query_counter))
+        seen.extend(order["id"] for order in response.json())
+
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == newest_first
+    assert len(set(page_queries)) == 1
+
+    shipped = authenticated_client.get("/orders/", params={"status": "shipped"})
+    assert [order["id"] for order in shipped.json()] == [orders[3].id, orders[1].id]
+
+    window = authenticated_client.get(
+        "/orders/",
+        params={
+            "date_from": (start + timedelta(days=1)).isoformat(),
+            "date_to": (start + timedelta(days=3)).isoformat(),
+        },
+    )
+    assert [order["id"] for order in window.json()] == [orders[2].id, orders[1].id]
+
+
+def test_create_order_with_idempotency_key_replays_the_first_response(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+    db_session: Session,
+):
+    """
+    A retried checkout with the same Idempotency-Key returns the stored
+    response and neither places a second order nor decrements stock again.
+    """
+    product_id = test_product.id
+    initial_stock = test_product.stock
+    authenticated_client.post("/cart/items", json={"product_id": product_id, "quantity": 2})
+
+    headers = {"Idempotency-Key": "checkout-attempt-1"}
+    first = authenticated_client.post("/orders/", headers=headers)
+    retry = authenticated_client.post("/orders/", headers=headers)
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    assert db_session.query(models.Order).count() == 1
+    db_session.expire_all()
+    assert db_session.get(models.Product, product_id).stock == initial_stock - 2
+
+    # A different key is a new checkout, and the cart is now empty.
+    other = authenticated_client.post("/orders/", headers={"Idempotency-Key": "checkout-attempt-2"})
+    assert other.status_code == 400
+
+
+def test_create_order_with_unreplayable_idempotency_key_conflicts(
+    authenticated_client: TestClient,
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+):
+    """
+    A used key without a stored response is reported as a conflict
+    instead of failing the request.
+    """
+    db_session.add(
+        models.IdempotencyKey(
+            user_id=test_user.id,
+            key="checkout-without-response",
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+    )
+    db_session.commit()
+    authenticated_client.post("/cart/items", json={"product_id": test_product.id, "quantity": 1})
+
+    response = authenticated_client.post(
+        "/orders/", headers={"Idempotency-Key": "checkout-without-response"}
+    )
+
+    assert response.status_code == 409
+    assert "Idempotency-Key" in response.json()["detail"]
+    assert db_session.query(models.Order).count() == 0
+
+
+def test_admin_order_list_filters_pages_and_counts(
+    admin_authenticated_client: TestClient,
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+):
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    orders = [
+        models.Order(
+            user_id=test_user.id,
+            order_date=start + timedelta(hours=i),
+            status=models.OrderStatus.PAID if i < 3 else models.OrderStatus.PENDING,
+            total_price=10 * (i + 1),
+            item_count=1,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+
+    params = {"user_id": test_user.id, "status": "paid", "limit": 2, "count": "exact"}
+    first_page = admin_authenticated_client.get("/admin/orders/", params=params)
+
+    assert first_page.status_code == 200
+    assert [order["id"] for order in first_page.json()] == [orders[2].id, orders[1].id]
+    assert first_page.headers["X-Total-Count"] == "3"
+    assert first_page.headers["X-Total-Count-Type"] == "exact"
+
+    second_page = admin_authenticated_client.get(
+        "/admin/orders/",
+        params={**params, "cursor": first_page.headers["X-Next-Cursor"]},
+    )
+    assert [order["id"] for order in second_page.json()] == [orders[0].id]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    big_spenders = admin_authenticated_client.get(
+        "/admin/orders/",
+        params={"user_id": test_user.id, "min_total": 40, "count": "estimated"},
+    )
+    assert [order["id"] for order in big_spenders.json()] == [orders[4].id, orders[3].id]
+    assert big_spenders.headers["X-Total-Count-Type"] == "estimated"
+    assert int(big_spenders.headers["X-Total-Count"]) >= 0
+
+
+def test_admin_bulk_status_update_reports_each_order(
+    admin_authenticated_client: TestClient,
+    admin_user: models.User,
+    test_user: models.User,
+    db_session: Session,
+):
+    """
+    Allowed transitions are applied and recorded in the history; other
+    orders are reported as unchanged, invalid or missing.
+    """
+    paid, pending, shipped = [
+        models.Order(user_id=test_user.id, status=order_status, total_price=10, item_count=1)
+        for order_status in (
+            models.OrderStatus.PAID,
+            models.OrderStatus.PENDING,
+            models.OrderStatus.SHIPPED,
+        )
+    ]
+    db_session.add_all([paid, pending, shipped])
+    db_session.commit()
+
+    response = admin_authenticated_client.post(
+        "/admin/orders/status",
+        json={"status": "shipped", "order_ids": [paid.id, pending.id, shipped.id, 999999]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 1
+    assert [(r["order_id"], r["previous_status"], r["result"]) for r in data["results"]] == [
+        (paid.id, "paid", "updated"),
+        (pending.id, "pending", "invalid_transition"),
+        (shipped.id, "shipped", "unchanged"),
+        (999999, None, "not_found"),
+    ]
+
+    db_session.expire_all()
+    assert db_session.get(models.Order, paid.id).status == models.OrderStatus.SHIPPED
+    assert db_session.get(models.Order, pending.id).status == models.OrderStatus.PENDING
+
+    (history,) = db_session.query(models.OrderStatusHistory).all()
+    assert (history.order_id, history.old_status, history.new_status) == (
+        paid.id,
+        models.OrderStatus.PAID,
+        models.OrderStatus.SHIPPED,
+    )
+    assert history.changed_by == admin_user.id
+
+
+def test_admin_bulk_status_update_by_filter(
+    admin_authenticated_client: TestClient,
+    test_user: models.User,
+    db_session: Session,
+):
+    orders = [
+        models.Order(user_id=test_user.id, status=models.OrderStatus.PENDING, total_price=10, item_count=1)
+        for _ in range(3)
+    ]
+    delivered = models.Order(
+        user_id=test_user.id, status=models.OrderStatus.DELIVERED, total_price=10, item_count=1
+    )
+    db_session.add_all([*orders, delivered])
+    db_session.commit()
+
+    response = admin_authenticated_client.post(
+        "/admin/orders/status",
+        json={"status": "cancelled", "filter": {"user_id": test_user.id}},
+    )
+
+    # Only orders that can be cancelled are selected.
+    assert response.status_code == 200
+    assert response.json()["updated"] == 3
+    assert response.json()["has_more"] is False
+    assert {result["order_id"] for result in response.json()["results"]} == {
+        order.id for order in orders
+    }
+    assert db_session.query(models.OrderStatusHistory).count() == 3
+
+    neither = admin_authenticated_client.post("/admin/orders/status", json={"status": "paid"})
+    assert neither.status_code == 422
+
+    only_nulls = admin_authenticated_client.post(
+        "/admin/orders/status", json={"status": "paid", "filter": {"status": None}}
+    )
+    assert only_nulls.status_code == 422
@@ -0,0 +1,85 @@
+# app/tests/test_outbox.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, outbox
+
+
+def _place_order(client: TestClient, product_id: int) -> dict:
+    client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+    response = client.post("/orders/")
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_order_events_are_delivered_by_the_worker(
+    authenticated_client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+    db_session: Session,
+):
+    """
+    Checkout and status changes only write outbox rows; the worker later
+    hands them to the registered handlers and marks them processed.
+    """
+    received = []
+
+    def handler(payload):
+        received.append(payload)
+
+    outbox.register_handler(outbox.ORDER_CREATED, handler)
+    outbox.register_handler(outbox.ORDER_STATUS_CHANGED, handler)
+    try:
+        order = _place_order(authenticated_client, test_product.id)
+        admin_authenticated_client.patch(
+            f"/admin/orders/{order['id']}", json={"status": "paid"}
+        )
+        assert received == []
+
+        assert outbox.run_once(db_session) == 2
+    finally:
+        outbox.unregister_handler(outbox.ORDER_CREATED, handler)
+        outbox.unregister_handler(outbox.ORDER_STATUS_CHANGED, handler)
+
+    created, status_changed = received
+    assert created["id"] == order["id"]
+    assert created["items"][0]["product_id"] == test_product.id
+    assert status_changed == {
+        "order_id": order["id"],
+        "user_id": created["user_id"],
+        "old_status": "pending",
+        "new_status": "paid",
+    }
+
+    pending = db_session.query(models.OutboxEvent).filter(
+        models.OutboxEvent.processed_at.is_(None)
+    )
+    assert pending.count() == 0
+    assert outbox.run_once(db_session) == 0
+
+
+def test_failed_events_are_retried_later(
+    authenticated_client: TestClient,
+    test_product: models.Product,
+    db_session: Session,
+):
+    def failing_handler(payload):
+        raise RuntimeError("warehouse unavailable")
+
+    outbox.register_handler(outbox.ORDER_CREATED, failing_handler)
+    try:
+        _place_order(authenticated_client, test_product.id)
+        assert outbox.run_once(db_session) == 1
+    finally:
+        outbox.unregister_handler(outbox.ORDER_CREATED, failing_handler)
+
+    event = db_session.query(models.OutboxEvent).one()
+    db_session.refresh(event)
+    assert event.processed_at is None
+    assert event.attempts == 1
+    assert "warehouse unavailable" in event.last_error
+    assert event.available_at > event.created_at
+
+    # Backed off: not due again yet.
+    assert outbox.run_once(db_session) == 0
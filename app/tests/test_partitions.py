@@ -0,0 +1,66 @@
+# app/tests/test_partitions.py
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models, partitions
+
+
+def test_orders_route_to_monthly_partitions_and_detach(
+    test_user: models.User,
+    test_product: models.Product,
+    db_session: Session,
+):
+    created = partitions.create_partitions(
+        db_session, months_ahead=1, start=date(2030, 1, 15)
+    )
+    assert created == [
+        "orders_p2030_01",
+        "orders_p2030_02",
+        "order_items_p2030_01",
+        "order_items_p2030_02",
+    ]
+    # Existing partitions are skipped.
+    assert partitions.create_partitions(db_session, months_ahead=1, start=date(2030, 1, 1)) == []
+
+    order = models.Order(
+        user_id=test_user.id,
+        order_date=datetime(2030, 1, 31, 23, 59, tzinfo=timezone.utc),
+        total_price=10,
+        item_count=1,
+    )
+    db_session.add(order)
+    db_session.flush()
+    db_session.add(
+        models.OrderItem(
+            order_id=order.id,
+            order_date=order.order_date,
+            product_id=test_product.id,
+            product_name=test_product.name,
+            category_id=test_product.category_id,
+            quantity=1,
+            price=10,
+        )
+    )
+    db_session.commit()
+
+    def partition_of(table: str) -> str:
+        return db_session.execute(
+            text(f"SELECT tableoid::regclass::text FROM {table} WHERE order_date = :d"),
+            {"d": order.order_date},
+        ).scalar_one()
+
+    assert partition_of("orders") == "orders_p2030_01"
+    assert partition_of("order_items") == "order_items_p2030_01"
+
+    detached = partitions.detach_partitions(
+        db_session, before=date(2030, 2, 1), archive_schema="order_archive"
+    )
+
+    assert detached == ["order_items_p2030_01", "orders_p2030_01"]
+    assert db_session.query(models.Order).filter(models.Order.id == order.id).count() == 0
+    assert db_session.execute(
+        text("SELECT count(*) FROM order_archive.orders_p2030_01")
+    ).scalar_one() == 1
@@ -0,0 +1,442 @@
+# app/tests/test_products.py
+
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app import models
+
+
+def _create_products(db_session: Session, category: models.Category, count: int):
+    products = [
+        models.Product(
+            name=f"Catalog Product {i}",
+            description="A product for catalog tests",
+            price=10 + i,
+            stock=5,
+            category_id=category.id,
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    return products
+
+
+def test_list_products_with_cursor_pagination(
+    client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    """
+    Walking the catalog with X-Next-Cursor visits every product exactly once.
+    """
+    products = _create_products(db_session, test_category, 5)
+
+    seen = []
+    response = client.get(
+        "/products/",
+        params={"category_id": test_category.id, "limit": 2},
+    )
+
+    while True:
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+
+        response = client.get(
+            "/products/",
+            params={
+                "category_id": test_category.id,
+                "limit": 2,
+                "cursor": next_cursor,
+            },
+        )
+
+    assert seen == sorted(product.id for product in products)
+
+
+def test_list_products_rejects_invalid_cursor(client: TestClient):
+    response = client.get("/products/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert "cursor" in response.json()["detail"].lower()
+
+
+def test_search_products_ranks_name_matches_first(
+    client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    """
+    Full-text search matches stemmed words and ranks name hits above
+    description-only hits.
+    """
+    description_hit = models.Product(
+        name="Desk Lamp",
+        description="Pairs nicely with a wireless keyboard",
+        price=25,
+        stock=5,
+        category_id=test_category.id,
+    )
+    name_hit = models.Product(
+        name="Wireless Keyboards",
+        description="Mechanical switches",
+        price=80,
+        stock=5,
+        category_id=test_category.id,
+    )
+    unrelated = models.Product(
+        name="Coffee Mug",
+        description="Ceramic",
+        price=8,
+        stock=5,
+        category_id=test_category.id,
+    )
+    db_session.add_all([description_hit, name_hit, unrelated])
+    db_session.commit()
+
+    response = client.get(
+        "/products/",
+        params={"category_id": test_category.id, "q": "keyboard"},
+    )
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [
+        name_hit.id,
+        description_hit.id,
+    ]
+
+    # The relevance-ordered results can be walked with a cursor as well.
+    first_page = client.get(
+        "/products/",
+        params={"category_id": test_category.id, "q": "keyboard", "limit": 1},
+    )
+    second_page = client.get(
+        "/products/",
+        params={
+            "category_id": test_category.id,
+            "q": "keyboard",
+            "limit": 1,
+            "cursor": first_page.headers["X-Next-Cursor"],
+        },
+    )
+    assert [item["id"] for item in second_page.json()] == [description_hit.id]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_list_products_returns_summaries_in_one_query(
+    client: TestClient,
+    test_product: models.Product,
+    test_user: models.User,
+    db_session: Session,
+    query_counter: list,
+):
+    """
+    The listing embeds category and rating aggregates but no reviews,
+    and loads the whole page with a single query.
+    """
+    db_session.add(
+        models.Review(user_id=test_user.id, product_id=test_product.id, rating=4)
+    )
+    test_product.review_count = 1
+    test_product.rating_sum = 4
+    db_session.commit()
+    category_id = test_product.category_id
+
+    query_counter.clear()
+    response = client.get("/products/", params={"category_id": category_id})
+
+    assert response.status_code == 200
+    assert len(query_counter) == 1
+
+    (item,) = response.json()
+    assert "reviews" not in item
+    assert item["category"]["id"] == category_id
+    assert item["review_count"] == 1
+    assert item["average_rating"] == 4
+
+
+def test_admin_product_listing_returns_summaries(
+    admin_authenticated_client: TestClient,
+    client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    products = _create_products(db_session, test_category, 3)
+    ids = {product.id for product in products}
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = admin_authenticated_client.get("/products/admin", params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        for item in response.json():
+            if item["id"] in ids:
+                assert "reviews" not in item
+                assert item["category"]["id"] == test_category.id
+                seen.append(item["id"])
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    assert seen == sorted(ids)
+    assert client.get("/products/admin").status_code == 401
+
+
+def test_admin_product_detail(
+    admin_authenticated_client: TestClient,
+    client: TestClient,
+    test_product: models.Product,
+):
+    product_id = test_product.id
+
+    response = admin_authenticated_client.get(f"/products/admin/{product_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == product_id
+
+    assert admin_authenticated_client.get("/products/admin/999999").status_code == 404
+    assert client.get(f"/products/admin/{product_id}").status_code == 401
+
+
+def test_get_product_conditional_request(
+    client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+):
+    """
+    A revalidation with the current ETag gets a 304 without a body,
+    and an admin update invalidates the ETag.
+    """
+    product_id = test_product.id
+
+    response = client.get(f"/products/{product_id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+
+    revalidation = client.get(
+        f"/products/{product_id}", headers={"If-None-Match": etag}
+    )
+    assert revalidation.status_code == 304
+    assert revalidation.content == b""
+    assert revalidation.headers["ETag"] == etag
+
+    update = admin_authenticated_client.put(
+        f"/products/{product_id}",
+        json={
+            "name": "Test Product",
+            "description": "A product for testing",
+            "price": "99.99",
+            "stock": 3,
+            "category_id": test_product.category_id,
+        },
+    )
+    assert update.status_code == 200
+
+    after_update = client.get(
+        f"/products/{product_id}", headers={"If-None-Match": etag}
+    )
+    assert after_update.status_code == 200
+    assert after_update.headers["ETag"] != etag
+    assert after_update.json()["stock"] == 3
+
+
+def test_list_products_conditional_request(
+    client: TestClient,
+    admin_authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    """
+    Listings revalidate by ETag only, so removing a product from the page
+    is never answered with a stale 304.
+    """
+    products = _create_products(db_session, test_category, 2)
+
+    response = client.get("/products/")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+
+    revalidation = client.get("/products/", headers={"If-None-Match": etag})
+    assert revalidation.status_code == 304
+
+    deleted = admin_authenticated_client.delete(f"/products/{products[0].id}")
+    assert deleted.status_code == 204
+
+    after_delete = client.get("/products/", headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert [p["id"] for p in after_delete.json()] == [products[1].id]
+
+    since = client.get(
+        "/products/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert since.status_code == 200
+
+
+def test_search_products_returns_facets(
+    client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+    query_counter: list,
+):
+    """
+    Category counts ignore the selected category; price buckets and
+    stock counts apply every filter.
+    """
+    other_category = models.Category(name=f"{test_category.name} (other)")
+    db_session.add(other_category)
+    db_session.commit()
+
+    db_session.add_all([
+        models.Product(name="Facet Widget One", price=10, stock=3, category_id=test_category.id),
+        models.Product(name="Facet Widget Two", price=60, stock=0, category_id=test_category.id),
+        models.Product(name="Facet Widget Three", price=600, stock=1, category_id=other_category.id),
+        models.Product(name="Unrelated Gadget", price=15, stock=1, category_id=test_category.id),
+    ])
+    db_session.commit()
+    category_id = test_category.id
+    other_category_id = other_category.id
+
+    query_counter.clear()
+    response = client.get(
+        "/products/search",
+        params={"q": "widget", "category_id": category_id},
+    )
+
+    assert response.status_code == 200
+    assert len(query_counter) == 2  # the page and the facets
+
+    data = response.json()
+    assert {item["name"] for item in data["items"]} == {
+        "Facet Widget One",
+        "Facet Widget Two",
+    }
+
+    facets = data["facets"]
+    assert facets["total"] == 2
+    assert facets["in_stock"] == 1
+    assert {
+        facet["category_id"]: facet["count"] for facet in facets["categories"]
+    } == {category_id: 2, other_category_id: 1}
+
+    buckets = {float(b["min_price"]): b["count"] for b in facets["price_buckets"]}
+    assert buckets[0] == 1
+    assert buckets[50] == 1
+    assert buckets[500] == 0
+
+
+def test_admin_bulk_import_csv_reports_row_errors(
+    admin_authenticated_client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+):
+    category_id = test_category.id
+    content = (
+        "name,description,price,stock,category_id\n"
+        f"Imported Chair,Oak chair,120.00,4,{category_id}\n"
+        f"Imported Table,,-5,2,{category_id}\n"
+        "Imported Lamp,,30.00,7,999999\n"
+        f"Imported Stool,,45.50,0,{category_id}\n"
+    )
+
+    response = admin_authenticated_client.post(
+        "/products/import",
+        files={"file": ("products.csv", content, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2
+    assert result["failed"] == 2
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+    assert "price" in result["errors"][0]["error"]
+    assert "999999" in result["errors"][1]["error"]
+
+    names = {
+        product.name
+        for product in db_session.query(models.Product).filter(
+            models.Product.category_id == category_id
+        )
+    }
+    assert names == {"Imported Chair", "Imported Stool"}
+
+
+def test_admin_bulk_import_ndjson(
+    admin_authenticated_client: TestClient,
+    test_category: models.Category,
+):
+    content = (
+        f'{{"name": "Imported Desk", "price": "250.00", "stock": 1, "category_id": {test_category.id}}}\n'
+        "not json\n"
+    )
+
+    response = admin_authenticated_client.post(
+        "/products/import",
+        params={"format": "ndjson"},
+        files={"file": ("feed.txt", content, "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert response.json()["errors"][0]["row"] == 2
+
+
+def test_admin_export_streams_ndjson_and_csv(
+    admin_authenticated_client: TestClient,
+    test_product: models.Product,
+):
+    product_id = test_product.id
+
+    response = admin_authenticated_client.get("/products/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    (row,) = [row for row in rows if row["id"] == product_id]
+    assert row["name"] == "Test Product"
+    assert row["review_count"] == 0
+    assert "reviews" not in row
+
+    response = admin_authenticated_client.get(
+        "/products/export", params={"format": "csv"}
+    )
+    assert response.status_code == 200
+
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,name,description,price,stock")
+    assert any(line.startswith(f"{product_id},Test Product,") for line in lines[1:])
+
+
+def test_batch_lookup_preserves_order_and_reports_missing(
+    client: TestClient,
+    test_category: models.Category,
+    db_session: Session,
+    query_counter: list,
+):
+    first, second, third = _create_products(db_session, test_category, 3)
+    ids = [third.id, 999999, first.id, third.id]
+
+    query_counter.clear()
+    response = client.get("/products/batch", params={"ids": ids})
+
+    assert response.status_code == 200
+    assert len(query_counter) == 3  # products, categories, reviews
+
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [third.id, first.id]
+    assert data["items"][0]["category"]["id"] == test_category.id
+    assert data["missing"] == [999999]
+
+
+def test_batch_lookup_limits_the_number_of_ids(client: TestClient):
+    response = client.get("/products/batch", params={"ids": list(range(1, 102))})
+
+    assert response.status_code == 422
@@ -1,6 +1,9 @@
+import uuid
+
 from fastapi import status
 from fastapi.testclient import TestClient
 from app import models
+from app.repositories import product as product_repository
 
 
 def test_create_review_success(
@@ -24,9 +27,12 @@ def test_create_review_success(
 
     order_item = models.OrderItem(
         order_id=order.id,
+        order_date=order.order_date,
         product_id=test_product.id,
         quantity=1,
         price=test_product.price,
+        product_name=test_product.name,
+        category_id=test_product.category_id,
     )
     db_session.add(order_item)
     db_session.commit()
@@ -51,3 +57,96 @@ def test_create_review_success(
     assert data["comment"] == "Amazing product!"
     assert data["product_id"] == test_product.id
     assert data["user_id"] == test_user.id
+
+    # The product's rating aggregates are updated with the review.
+    db_session.refresh(test_product)
+    assert test_product.review_count == 1
+    assert test_product.rating_sum == 5
+    assert test_product.average_rating == 5
+
+
+def test_rebuild_rating_aggregates(
+    db_session,
+    test_user: models.User,
+    test_product: models.Product,
+):
+    """
+    The reconciliation command restores aggregates that drifted from the reviews.
+    """
+    db_session.add(
+        models.Review(user_id=test_user.id, product_id=test_product.id, rating=3)
+    )
+    test_product.review_count = 7
+    test_product.rating_sum = 2
+    db_session.commit()
+
+    corrected = product_repository.rebuild_rating_aggregates(db_session)
+    db_session.commit()
+
+    db_session.refresh(test_product)
+    assert corrected == 1
+    assert test_product.review_count == 1
+    assert test_product.rating_sum == 3
+    assert test_product.average_rating == 3
+
+
+def _add_reviews(db_session, product: models.Product, ratings):
+    reviews = []
+    for rating in ratings:
+        user = models.User(
+            email=f"reviewer_{uuid.uuid4()}@example.com",
+            hashed_password="not-used",
+        )
+        db_session.add(user)
+        db_session.flush()
+        review = models.Review(user_id=user.id, product_id=product.id, rating=rating)
+        db_session.add(review)
+        reviews.append(review)
+    db_session.commit()
+    return reviews
+
+
+def test_get_reviews_paginated_by_rating(
+    client: TestClient,
+    db_session,
+    test_product: models.Product,
+):
+    """
+    Walking the highest-rated reviews with a cursor returns every review once,
+    ordered by rating and then newest first.
+    """
+    reviews = _add_reviews(db_session, test_product, [5, 3, 5, 1, 4])
+    expected = [
+        review.id
+        for review in sorted(reviews, key=lambda r: (-r.rating, -r.id))
+    ]
+
+    seen = []
+    params = {"sort": "highest", "limit": 2}
+    while True:
+        response = client.get(f"/products/{test_product.id}/reviews", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(review["id"] for review in response.json())
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        params["cursor"] = next_cursor
+
+    assert seen == expected
+
+
+def test_get_review_summary_histogram(
+    client: TestClient,
+    db_session,
+    test_product: models.Product,
+):
+    _add_reviews(db_session, test_product, [5, 3, 5, 1])
+
+    response = client.get(f"/products/{test_product.id}/reviews/summary")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["review_count"] == 4
+    assert data["average_rating"] == 3.5
+    assert data["histogram"] == {"1": 1, "2": 0, "3": 1, "4": 0, "5": 2}